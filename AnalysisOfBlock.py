@@ -2,7 +2,6 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.backends import default_backend
 import time
-from tabulate import tabulate
 
 def pad(data, block_size):
     padder = padding.PKCS7(block_size).padder()
@@ -69,6 +68,8 @@ def key_change_effect(plaintext, key, mode, algorithm='DES'):
     return original_ciphertext, modified_ciphertext, changed_bits, key, modified_key
 
 def main():
+    from tabulate import tabulate
+
     plaintext = b"vuvjslgj"
     aes_key = b"thisoneis16long#"
     des_key = b"jgoo90r0"  # Updated to correct 8-byte DES key
@@ -1,31 +1,76 @@
-from PIL import Image
-import matplotlib.pyplot as plt
+import numpy as np
 
 class ShiftCypher:
     def __init__(self, key):
         self.key = key
+        # Translation tables for ASCII text and for every byte value
+        self.encrypt_table = str.maketrans({x: (x + key) % 128 for x in range(128)})
+        self.decrypt_table = str.maketrans({x: (x - key) % 128 for x in range(128)})
+        self.encrypt_bytes_table = bytes((x + key) % 128 for x in range(256))
+        self.decrypt_bytes_table = bytes((x - key) % 128 for x in range(256))
 
     def encrypt(self, para):
+        if isinstance(para, (bytes, bytearray)):
+            return para.translate(self.encrypt_bytes_table)
+        if para.isascii():
+            return para.translate(self.encrypt_table)
         return "".join([chr((ord(x) + self.key) % 128) for x in para])
 
     def decrypt(self, encrypted):
+        if isinstance(encrypted, (bytes, bytearray)):
+            return encrypted.translate(self.decrypt_bytes_table)
+        if encrypted.isascii():
+            return encrypted.translate(self.decrypt_table)
         return "".join([chr((ord(x) - self.key) % 128) for x in encrypted])
 
+    def process_file(self, source, destination, operation, chunk_size=1 << 20):
+        # Streams source to destination in fixed-size chunks; works with text
+        # or binary handles. Returns the number of characters or bytes written
+        if operation == 'encrypt':
+            process = self.encrypt
+        elif operation == 'decrypt':
+            process = self.decrypt
+        else:
+            raise ValueError("Operation must be 'encrypt' or 'decrypt'.")
+
+        total = 0
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return total
+            total += destination.write(process(chunk))
+
+    def encrypt_file(self, source, destination, chunk_size=1 << 20):
+        return self.process_file(source, destination, 'encrypt', chunk_size)
+
+    def decrypt_file(self, source, destination, chunk_size=1 << 20):
+        return self.process_file(source, destination, 'decrypt', chunk_size)
+
 
 class ShiftCypherInts:
     def __init__(self, key):
         self.key = key
 
-    def process_pixel(self, pixel, operation):
-        r, g, b = pixel
-        bw = r + g + b % 256 * 3
+    def shift(self, operation):
         if operation == 'encrypt':
-            return ((r + self.key) % 256, (r + self.key) % 256, (r + self.key) % 256)
+            return self.key
         elif operation == 'decrypt':
-            return ((r - self.key) % 256, (r - self.key) % 256, (r - self.key) % 256)
+            return -self.key
         else:
             raise ValueError("Operation must be 'encrypt' or 'decrypt'.")
 
+    def table(self, operation):
+        # Shifted value of every possible channel value, indexed by the value
+        return ((np.arange(256) + self.shift(operation)) % 256).astype(np.uint8)
+
+    def process_pixel(self, pixel, operation):
+        shift = self.shift(operation)
+        return tuple((value + shift) % 256 for value in pixel)
+
+    def process_array(self, pixels, operation):
+        # Every channel of every pixel in one table lookup
+        return np.take(self.table(operation), np.asarray(pixels, dtype=np.uint8))
+
     def encrypt(self, pixel):
         return self.process_pixel(pixel, 'encrypt')
 
@@ -46,20 +91,16 @@ def ascii_cypher():
 
 def apply_cipher(image, key, operation):
     cypher = ShiftCypherInts(key)
-    pixels = list(image.getdata())
-    if operation == 'encrypt':
-        new_pixels = [cypher.encrypt(pixel) for pixel in pixels]
-    elif operation == 'decrypt':
-        new_pixels = [cypher.decrypt(pixel) for pixel in pixels]
-    else:
-        raise ValueError("Operation must be 'encrypt' or 'decrypt'.")
-
-    new_image = Image.new(image.mode, image.size)
-    new_image.putdata(new_pixels)
-    return new_image
+    if image.mode not in ('L', 'RGB', 'RGBA'):
+        image = image.convert('RGB')
+    # Pillow applies the same 256-entry table to each band in C
+    table = cypher.table(operation).tolist()
+    return image.point(table * len(image.getbands()))
 
 
 def show_images(original, encrypted, decrypted):
+    import matplotlib.pyplot as plt
+
     # Create a matplotlib figure
     plt.figure(figsize=(15, 5))
 
@@ -88,6 +129,8 @@ def show_images(original, encrypted, decrypted):
 
 
 def image_cypher():
+    from PIL import Image
+
     key = int(input("Enter Key: "))
     try:
         original_image = Image.open("nature.jpg")
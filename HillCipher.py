@@ -1,64 +1,253 @@
+import secrets
+import time
+from functools import lru_cache
+
 import numpy as np
-from PIL import Image
 
 def mod_inverse(a, m):
     """Compute the modular inverse of a under modulo m."""
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    return None
+    try:
+        return pow(int(a), -1, m)  # extended Euclid
+    except ValueError:
+        return None
+
+def matrix_mod_inverse(matrix, modulus=256):
+    """Exact inverse of a square integer matrix modulo m, or None if singular."""
+    matrix = np.asarray(matrix, dtype=np.int64)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Key matrix must be square")
+    inverse = cached_matrix_inverse(matrix.tobytes(), matrix.shape[0], modulus)
+    return None if inverse is None else inverse.copy()
+
+@lru_cache(maxsize=128)
+def cached_matrix_inverse(matrix_bytes, n, modulus):
+    """Gauss-Jordan elimination over the integers mod m, cached per key."""
+    # Entries stay below m, so products fit in int64 for any modulus below 2**31
+    matrix = np.frombuffer(matrix_bytes, dtype=np.int64).reshape(n, n) % modulus
+    augmented = np.concatenate([matrix, np.eye(n, dtype=np.int64)], axis=1)
+
+    for col in range(n):
+        # Z/m may have no unit in this column even when the matrix is
+        # invertible, so Euclid's algorithm on the rows leaves the column's gcd
+        # in the pivot, which must then be a unit
+        for row in range(col + 1, n):
+            while augmented[row, col]:
+                quotient = augmented[col, col] // augmented[row, col]
+                augmented[col] = (augmented[col] - quotient * augmented[row]) % modulus
+                augmented[[col, row]] = augmented[[row, col]]
+
+        pivot_inverse = mod_inverse(augmented[col, col], modulus)
+        if pivot_inverse is None:
+            return None
+        augmented[col] = (augmented[col] * pivot_inverse) % modulus
+
+        factors = augmented[:, col].copy()
+        factors[col] = 0
+        augmented = (augmented - np.outer(factors, augmented[col])) % modulus
+
+    inverse = augmented[:, n:]
+    inverse.flags.writeable = False
+    return inverse
+
+def prime_factors(m):
+    """Distinct prime factors of m by trial division."""
+    factors = []
+    p = 2
+    while p * p <= m:
+        if m % p == 0:
+            factors.append(p)
+            while m % p == 0:
+                m //= p
+        p += 1
+    if m > 1:
+        factors.append(m)
+    return factors
+
+def is_invertible_mod_2(matrix):
+    """Elimination over GF(2) with each row packed into one Python int."""
+    bits = np.packbits(np.asarray(matrix, dtype=np.uint8) & 1, axis=1)
+    rows = [int.from_bytes(row.tobytes(), 'big') for row in bits]
+    for col in range(len(rows)):
+        mask = 1 << (len(bits[0]) * 8 - 1 - col)
+        pivot = next((i for i in range(col, len(rows)) if rows[i] & mask), None)
+        if pivot is None:
+            return False
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for i in range(col + 1, len(rows)):
+            if rows[i] & mask:
+                rows[i] ^= rows[col]
+    return True
 
-def encrypt_block(block, key_matrix):
+def is_invertible_mod_prime(matrix, p):
+    """Elimination over GF(p) for an odd prime p."""
+    rows = np.asarray(matrix, dtype=np.int64) % p
+    n = rows.shape[0]
+    for col in range(n):
+        nonzero = np.flatnonzero(rows[col:, col])
+        if len(nonzero) == 0:
+            return False
+        pivot = col + nonzero[0]
+        rows[[col, pivot]] = rows[[pivot, col]]
+        rows[col] = rows[col] * pow(int(rows[col, col]), -1, p) % p
+        rows[col + 1:] = (rows[col + 1:] - np.outer(rows[col + 1:, col], rows[col])) % p
+    return True
+
+def is_invertible_mod(matrix, modulus=256):
+    """Check invertibility mod m by checking it mod every prime factor of m."""
+    matrix = np.asarray(matrix, dtype=np.int64)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Key matrix must be square")
+    for p in prime_factors(modulus):
+        # For m = 256 this is an odd determinant, found by elimination mod 2
+        # rather than through a floating point determinant
+        if p == 2:
+            if not is_invertible_mod_2(matrix % 2):
+                return False
+        elif not is_invertible_mod_prime(matrix, p):
+            return False
+    return True
+
+def random_invertible_matrix(n, modulus=256, rng=None):
+    """Uniformly random n x n matrix invertible mod m."""
+    rng = np.random.default_rng(secrets.randbits(128) if rng is None else rng)
+    # Rejection sampling stays uniform over invertible matrices; for m = 256
+    # about 3.5 draws are needed on average
+    while True:
+        matrix = rng.integers(0, modulus, size=(n, n), dtype=np.int64)
+        if is_invertible_mod(matrix, modulus):
+            return matrix
+
+def benchmark_key_generation(sizes=(2, 15, 32, 64), modulus=256, count=200):
+    """Print and return keys per second generated for each matrix size."""
+    results = {}
+    for n in sizes:
+        start = time.perf_counter()
+        for _ in range(count):
+            random_invertible_matrix(n, modulus)
+        results[n] = count / (time.perf_counter() - start)
+        print(f"n={n}: {results[n]:,.0f} keys/s")
+    return results
+
+def encrypt_block(block, key_matrix, modulus=256):
     """Encrypt a block of the image using the Hill cipher key matrix."""
-    return np.dot(key_matrix, block) % 256
+    return np.dot(key_matrix, block) % modulus
 
-def decrypt_block(block, inv_key_matrix):
+def decrypt_block(block, inv_key_matrix, modulus=256):
     """Decrypt a block of the image using the Hill cipher inverse key matrix."""
-    return np.dot(inv_key_matrix, block) % 256
+    return np.dot(inv_key_matrix, block) % modulus
 
-def hill_cipher_image(image_path, key_matrix, mode='encrypt'):
-    """Encrypt or decrypt an image using the Hill cipher."""
-    img = Image.open(image_path)
-    img = img.convert('L')  # Convert to grayscale
-    pixels = np.array(img)
+def exact_dtype(n, modulus=256):
+    """Smallest dtype whose matrix products of n residues stay integer-exact."""
+    largest_sum = n * (modulus - 1) ** 2
+    if largest_sum < 2 ** 24:
+        return np.float32
+    if largest_sum < 2 ** 53:
+        return np.float64
+    return np.int64
 
-    n = key_matrix.shape[0]
+def hill_cipher_array(pixels, matrix, chunk_size=1 << 18):
+    """Apply a Hill key matrix to every n-pixel column of a 2-D array at once."""
+    n = matrix.shape[0]
+    height, width = pixels.shape
+    if height % n:
+        raise ValueError("Array height must be a multiple of the key size")
 
-    if mode == 'decrypt':
-        det = int(np.round(np.linalg.det(key_matrix)))
-        det_inv = mod_inverse(det, 256)
+    # Floating point BLAS is only used while every partial sum is exact
+    dtype = exact_dtype(n)
+    matrix = (np.asarray(matrix, dtype=np.int64) % 256).astype(dtype)
+    bands = pixels.reshape(height // n, n, width)
+    processed = np.empty(bands.shape, dtype=np.uint8)
 
-        if det_inv is None:
+    bands_per_chunk = max(1, chunk_size // max(width, 1))
+    for start in range(0, bands.shape[0], bands_per_chunk):
+        # Multiplying every n x n tile by the key is the same as multiplying
+        # the key with every column of each n-row band, so the bands of a
+        # chunk go through as one (n, M) stack of column vectors
+        chunk = bands[start:start + bands_per_chunk]
+        columns = chunk.transpose(1, 0, 2).reshape(n, -1).astype(dtype)
+        product = encrypt_block(columns, matrix).astype(np.uint8)
+        processed[start:start + bands_per_chunk] = product.reshape(n, -1, width).transpose(1, 0, 2)
+
+    return processed.reshape(height, width)
+
+def select_key(key_matrix, mode):
+    """Return the key matrix for encryption or its inverse mod 256 for decryption."""
+    if mode == 'encrypt':
+        # Reject a bad key now rather than producing an image nobody can decrypt
+        if not is_invertible_mod(key_matrix, 256):
             raise ValueError("Key matrix is not invertible under mod 256")
+        return key_matrix
 
-        adjugate_matrix = np.round(det * np.linalg.inv(key_matrix)).astype(int) % 256
-        inv_key_matrix = (det_inv * adjugate_matrix) % 256
-    else:
-        inv_key_matrix = None
+    inv_key_matrix = matrix_mod_inverse(key_matrix, 256)
+    if inv_key_matrix is None:
+        raise ValueError("Key matrix is not invertible under mod 256")
+    return inv_key_matrix
+
+def color_mode(img):
+    """Keep grayscale, RGB and RGBA images as they are; convert anything else to RGB."""
+    return img.mode if img.mode in ('L', 'RGB', 'RGBA') else 'RGB'
+
+def hill_cipher_pixels(pixels, matrix, chunk_size=1 << 18, keep_padding=False):
+    """Encrypt or decrypt an (H, W) or (H, W, C) array, every channel with the same key."""
+    n = matrix.shape[0]
+    height = pixels.shape[0]
+
+    # With channels interleaved along each row, every column of the 2-D view
+    # is a single channel of a single pixel column
+    rows = pixels.reshape(height, -1)
+
+    # Pad the height to make sure it is divisible by n
+    padded_height = (height + n - 1) // n * n
+    padded_rows = np.pad(rows, ((0, padded_height - height), (0, 0)),
+                         mode='constant', constant_values=0)
+
+    processed_rows = hill_cipher_array(padded_rows, matrix, chunk_size)
+    if keep_padding:
+        # The whole last band is needed to decrypt it, padding rows included
+        return processed_rows.reshape((padded_height,) + pixels.shape[1:])
+
+    # Crop padding for the final pixels
+    return processed_rows[:height].reshape(pixels.shape)
 
-    # Pad the image to make sure dimensions are divisible by n
-    padded_height = (pixels.shape[0] + n - 1) // n * n
-    padded_width = (pixels.shape[1] + n - 1) // n * n
-    padded_pixels = np.pad(pixels, ((0, padded_height - pixels.shape[0]), 
-                                    (0, padded_width - pixels.shape[1])), 
-                          mode='constant', constant_values=0)
+# Encrypted images that keep their padding rows record the original height
+# under this key, in a PNG text chunk or a PGM/PPM header comment
+HEIGHT_KEY = 'hill_height'
 
-    processed_pixels = np.copy(padded_pixels)
+def height_info(height):
+    """PNG text chunk holding the original image height."""
+    from PIL.PngImagePlugin import PngInfo
 
-    for i in range(0, padded_pixels.shape[0], n):
-        for j in range(0, padded_pixels.shape[1], n):
-            block = padded_pixels[i:i+n, j:j+n]
+    info = PngInfo()
+    info.add_text(HEIGHT_KEY, str(height))
+    return info
 
-            if mode == 'encrypt':
-                processed_block = encrypt_block(block, key_matrix)
-            else:
-                processed_block = decrypt_block(block, inv_key_matrix)
+def stored_height(image_path):
+    """Original height recorded in an encrypted image, or None."""
+    from PIL import Image
 
-            # Ensure block is correctly reshaped back into the image
-            processed_pixels[i:i+n, j:j+n] = processed_block
+    with open(image_path, 'rb') as fp:
+        if fp.read(2) in (b'P5', b'P6'):
+            comment = b'# ' + HEIGHT_KEY.encode()
+            for line in fp.read(256).split(b'\n'):
+                if line.startswith(comment):
+                    return int(line.split()[-1])
+            return None
 
-    # Crop padding for the final image
-    final_pixels = processed_pixels[:pixels.shape[0], :pixels.shape[1]]
+    with Image.open(image_path) as img:
+        value = img.info.get(HEIGHT_KEY)
+    return None if value is None else int(value)
+
+def hill_cipher_image(image_path, key_matrix, mode='encrypt', chunk_size=1 << 18, image_mode='L'):
+    """Encrypt or decrypt an image using the Hill cipher."""
+    from PIL import Image
+
+    # Grayscale by default; 'RGB' or 'RGBA', or None to keep the image's colors
+    img = Image.open(image_path)
+    img = img.convert(image_mode or color_mode(img))
+    pixels = np.array(img)
+
+    matrix = select_key(key_matrix, mode)
+    final_pixels = hill_cipher_pixels(pixels, matrix, chunk_size)
 
     # Save the processed image
     processed_img = Image.fromarray(final_pixels.astype(np.uint8))
@@ -67,33 +256,211 @@ def hill_cipher_image(image_path, key_matrix, mode='encrypt'):
 
     return output_path
 
-# Define key matrix (must be invertible modulo 256)
-key_matrix = np.array( [
-   [1, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-   [3, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-   [6, 8, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-   [6, 8, 10, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-   [6, 8, 10, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-   [6, 8, 10, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-   [6, 8, 10, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
-   [6, 8, 10, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
-   [6, 8, 10, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
-   [6, 8, 10, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-   [0, 8, 10, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0],
-   [0, 8, 10, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0],
-   [0, 8, 10, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0],
-   [0, 8, 10, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
-   [0, 0, 10, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
-]
-)
-
-# Path to the image file
-image_path = 'nature.jpg'
-
-# Encrypt image
-encrypted_image_path = hill_cipher_image(image_path, key_matrix, mode='encrypt')
-print(f"Encrypted image saved to: {encrypted_image_path}")
-
-# Decrypt image
-decrypted_image_path = hill_cipher_image(encrypted_image_path, key_matrix, mode='decrypt')
-print(f"Decrypted image saved to: {decrypted_image_path}")
\ No newline at end of file
+def raw_tile_offset(img):
+    """File offset of the pixel data if the image is one uncompressed top-down tile, else None."""
+    if len(img.tile) != 1:
+        return None
+
+    codec, extents, offset, args = img.tile[0]
+    if isinstance(args, str):
+        args = (args,)
+    rawmode = args[0]
+    stride = args[1] if len(args) > 1 else 0
+    orientation = args[2] if len(args) > 2 else 1
+
+    row_bytes = img.size[0] * len(img.mode)
+    if (codec != 'raw' or tuple(extents) != (0, 0) + img.size or rawmode != img.mode
+            or stride not in (0, row_bytes) or orientation != 1):
+        return None
+    return offset
+
+def read_strips(image_path, strip_height, image_mode=None):
+    """Yield horizontal strips of an image as uint8 arrays, top to bottom."""
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        width, height = img.size
+        target_mode = image_mode or color_mode(img)
+        # Uncompressed single-tile files (binary PGM/PPM, raw TIFF) are read
+        # strip by strip from their pixel offset; others are decoded by PIL
+        offset = raw_tile_offset(img) if img.mode == target_mode else None
+
+        if offset is None:
+            img = img.convert(target_mode)
+            for top in range(0, height, strip_height):
+                yield np.array(img.crop((0, top, width, min(top + strip_height, height))))
+            return
+
+    channels = len(target_mode)
+    row_bytes = width * channels
+    shape = (width,) if channels == 1 else (width, channels)
+    with open(image_path, 'rb') as fp:
+        for top in range(0, height, strip_height):
+            rows = min(strip_height, height - top)
+            fp.seek(offset + top * row_bytes)
+            strip = np.frombuffer(fp.read(rows * row_bytes), dtype=np.uint8)
+            yield strip.reshape((rows,) + shape)
+
+def write_strips(strips, output_path, size, image_mode, original_height=None):
+    """Write strips to output_path as they arrive, recording original_height if given."""
+    from PIL import Image
+
+    width, height = size
+    # Grayscale and RGB PNM files are streamed straight to disk; other formats
+    # are assembled in memory and saved by PIL
+    if output_path.lower().endswith(('.pgm', '.ppm', '.pnm')) and image_mode in ('L', 'RGB'):
+        magic = b'P5' if image_mode == 'L' else b'P6'
+        if original_height is not None:
+            magic += b'\n# %s %d' % (HEIGHT_KEY.encode(), original_height)
+        with open(output_path, 'wb') as fp:
+            fp.write(magic + b'\n%d %d\n255\n' % (width, height))
+            for strip in strips:
+                fp.write(np.ascontiguousarray(strip, dtype=np.uint8).tobytes())
+        return
+
+    channels = len(image_mode)
+    shape = (height, width) if channels == 1 else (height, width, channels)
+    pixels = np.empty(shape, dtype=np.uint8)
+    top = 0
+    for strip in strips:
+        pixels[top:top + len(strip)] = strip
+        top += len(strip)
+    if original_height is not None and output_path.lower().endswith('.png'):
+        Image.fromarray(pixels).save(output_path, pnginfo=height_info(original_height))
+    else:
+        Image.fromarray(pixels).save(output_path)
+
+def crop_strips(strips, height):
+    """Yield strips until height rows have been produced, cutting the last one short."""
+    top = 0
+    for strip in strips:
+        if top >= height:
+            return
+        yield strip[:height - top]
+        top += len(strip)
+
+def hill_cipher_image_strips(image_path, key_matrix, output_path, mode='encrypt',
+                             strip_height=None, image_mode=None, chunk_size=1 << 18, height=None):
+    """Encrypt or decrypt an image in horizontal strips whose height is a multiple of n."""
+    from PIL import Image
+
+    n = key_matrix.shape[0]
+    matrix = select_key(key_matrix, mode)
+
+    with Image.open(image_path) as img:
+        width, image_height = img.size
+        target_mode = image_mode or color_mode(img)
+
+    if strip_height is None:
+        strip_height = chunk_size // (width * len(target_mode))
+    strip_height = max(n, strip_height // n * n)
+
+    strips = (hill_cipher_pixels(strip, matrix, chunk_size, keep_padding=True)
+              for strip in read_strips(image_path, strip_height, target_mode))
+
+    if mode == 'encrypt':
+        # The padded last band is written out whole and the real height is
+        # recorded, so decryption can recover every row
+        padded_height = (image_height + n - 1) // n * n
+        write_strips(strips, output_path, (width, padded_height), target_mode, image_height)
+    else:
+        if image_height % n:
+            raise ValueError("Encrypted image height must be a multiple of the key size")
+        # height overrides the recorded one, e.g. for formats without metadata
+        height = height or stored_height(image_path) or image_height
+        write_strips(crop_strips(strips, height), output_path, (width, height), target_mode)
+
+    return output_path
+
+ALPHABET_26 = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+ALPHABET_36 = ALPHABET_26 + "0123456789"
+ALPHABET_256 = "".join(map(chr, range(256)))
+
+@lru_cache(maxsize=16)
+def alphabet_tables(alphabet):
+    """Latin-1 code -> symbol index (-1 if absent) and symbol index -> latin-1 code."""
+    symbols = np.frombuffer(alphabet.encode('latin-1'), dtype=np.uint8)
+    if len(np.unique(symbols)) != len(symbols):
+        raise ValueError("Alphabet symbols must be unique")
+    indices = np.full(256, -1, dtype=np.int16)
+    indices[symbols] = np.arange(len(symbols))
+    return indices, symbols
+
+def hill_cipher_texts(messages, key_matrix, mode='encrypt', alphabet=ALPHABET_26):
+    """Encrypt or decrypt a batch of messages; returns padded results and original lengths."""
+    modulus = len(alphabet)
+    n = key_matrix.shape[0]
+    if mode == 'encrypt':
+        if not is_invertible_mod(key_matrix, modulus):
+            raise ValueError(f"Key matrix is not invertible under mod {modulus}")
+        matrix = key_matrix
+    else:
+        matrix = matrix_mod_inverse(key_matrix, modulus)
+        if matrix is None:
+            raise ValueError(f"Key matrix is not invertible under mod {modulus}")
+
+    indices, symbols = alphabet_tables(alphabet)
+    lengths = np.fromiter(map(len, messages), dtype=np.int64, count=len(messages))
+    try:
+        codes = np.frombuffer("".join(messages).encode('latin-1'), dtype=np.uint8)
+    except UnicodeEncodeError:
+        raise ValueError("Messages contain characters outside the alphabet") from None
+    values = indices[codes]
+    if (values < 0).any():
+        raise ValueError("Messages contain characters outside the alphabet")
+
+    # Scatter every message into its own slot, padded with the alphabet's
+    # first symbol to a multiple of n so no block spans two messages
+    padded_lengths = (lengths + n - 1) // n * n
+    padded_starts = np.cumsum(padded_lengths) - padded_lengths
+    starts = np.cumsum(lengths) - lengths
+    positions = np.arange(len(values)) + np.repeat(padded_starts - starts, lengths)
+    padded = np.zeros(int(padded_lengths.sum()), dtype=np.uint8)
+    padded[positions] = values
+
+    dtype = exact_dtype(n, modulus)
+    columns = padded.astype(dtype).reshape(-1, n).T
+    matrix = (np.asarray(matrix, dtype=np.int64) % modulus).astype(dtype)
+    processed = encrypt_block(columns, matrix, modulus).T.ravel().astype(np.uint8)
+
+    text = symbols[processed].tobytes().decode('latin-1')
+    ends = padded_starts + padded_lengths
+    results = [text[start:end] for start, end in zip(padded_starts.tolist(), ends.tolist())]
+    # Padding is kept; hill_strip_padding trims decrypted messages with lengths
+    return results, lengths
+
+def hill_strip_padding(messages, lengths):
+    """Trim decrypted messages back to their original lengths."""
+    return [message[:length] for message, length in zip(messages, np.asarray(lengths).tolist())]
+
+if __name__ == "__main__":
+    # Define key matrix (must be invertible modulo 256)
+    key_matrix = np.array( [
+       [1, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+       [3, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+       [6, 8, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+       [6, 8, 10, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+       [6, 8, 10, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+       [6, 8, 10, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+       [6, 8, 10, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+       [6, 8, 10, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
+       [6, 8, 10, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
+       [6, 8, 10, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+       [0, 8, 10, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0],
+       [0, 8, 10, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0],
+       [0, 8, 10, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0],
+       [0, 8, 10, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
+       [0, 0, 10, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+    ]
+    )
+
+    # Path to the image file
+    image_path = 'nature.jpg'
+
+    # Encrypt image
+    encrypted_image_path = hill_cipher_image(image_path, key_matrix, mode='encrypt')
+    print(f"Encrypted image saved to: {encrypted_image_path}")
+
+    # Decrypt image
+    decrypted_image_path = hill_cipher_image(encrypted_image_path, key_matrix, mode='decrypt')
+    print(f"Decrypted image saved to: {decrypted_image_path}")
@@ -1,5 +1,9 @@
+import bisect
+import math
+import secrets
+import time
+
 import numpy as np
-import random
 
 
 def to_binary(ascii_values):
@@ -23,68 +27,179 @@ def modinv(a, m):
     return x1 + m0 if x1 < 0 else x1
 
 
-class KnapsackCryptosystem:
-    def __init__(self, length=6):
-        self.private_key = self.generate_private_key(length)
-        self.m = sum(self.private_key) + random.randint(
-            10, 20
-        )  # everytime a new private key is generated
-        self.n = random.randint(2, self.m - 1)
-        while np.gcd(self.n, self.m) != 1:
-            self.n = random.randint(2, self.m - 1)
-        self.public_key = [(self.n * pk_elem) % self.m for pk_elem in self.private_key]
-
-    def generate_private_key(self, length):
-        private_key = [random.randint(1, 10)]
-        for _ in range(1, length):
-            next_value = sum(private_key) + random.randint(1, 10)
-            private_key.append(next_value)
-        return private_key
+# Block lengths up to this size decrypt through a table of all 2^length blocks
+TABLE_MAX_LENGTH = 16
 
-    def encrypt(self, plaintext):
-        ascii_values = [ord(c) for c in plaintext]
-        binary_str = to_binary(ascii_values)
-        print(f"{ascii_values = }")
-        print(f"{binary_str = }")
-
-        cipher_blocks = []
-        for i in range(0, len(binary_str), 6):
-            chunk = binary_str[i : i + 6]
-            chunk = chunk.ljust(6, "0")
-            encrypted_sum = sum(
-                int(bit) * self.public_key[j] for j, bit in enumerate(chunk)
-            )
-            cipher_blocks.append(encrypted_sum)
 
-        return cipher_blocks
+def random_between(low, high):
+    return low + secrets.randbelow(high - low + 1)
 
-    def decrypt(self, ciphertext):
-        n_inv = modinv(self.n, self.m)
-        decrypted_bits = []
-        for cipher_block in ciphertext:
-            c_prime = (cipher_block * n_inv) % self.m
 
-            bits = ["0"] * len(self.private_key)
-            for i in reversed(range(len(self.private_key))):
-                if self.private_key[i] <= c_prime:
-                    bits[i] = "1"
-                    c_prime -= self.private_key[i]
-            decrypted_bits.append("".join(bits))
+def chunk_sum_tables(weights, length):
+    # For every 8-bit chunk k of a block, the knapsack sum of each chunk
+    # value v, where bit j of v (MSB first) selects weights[8 * k + j]
+    tables = []
+    for start in range(0, length, 8):
+        table = [0] * 256
+        for value in range(1, 256):
+            table[value] = sum(
+                weights[start + j]
+                for j in range(min(8, length - start))
+                if value >> (7 - j) & 1
+            )
+        tables.append(table)
+    return tables
 
-        print(f"{decrypted_bits = }")
 
-        decrypted_binary_str = "".join(decrypted_bits)
-        print(f"{decrypted_binary_str = }")
-        return to_ascii(decrypted_binary_str)
+def pack_blocks(data, length):
+    # Split a byte string into length-bit blocks (the last one zero padded),
+    # returned as an (N, ceil(length / 8)) matrix of 8-bit chunks
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    bits = np.pad(bits, (0, -len(bits) % length)).reshape(-1, length)
+    return np.packbits(bits, axis=1)
 
 
-knapsack = KnapsackCryptosystem()
+def unpack_blocks(chunks, length, size=None):
+    bits = np.unpackbits(chunks, axis=1)[:, :length].ravel()
+    return np.packbits(bits[: len(bits) // 8 * 8])[:size].tobytes()
 
-plaintext = "Testing a very looong message"
-print("Original Plaintext:", plaintext)
 
-ciphertext = knapsack.encrypt(plaintext)
-print("Ciphertext:", ciphertext)
+class KnapsackCryptosystem:
+    def __init__(self, length=6, increment_bits=None):
+        # increment_bits=None keeps the classic tiny 1..10 increments; larger
+        # values give big-integer keys with realistic sizes
+        self.length = length
+        self.private_key = self.generate_private_key(length, increment_bits)
+        self.m = sum(self.private_key) + random_between(10, 20)  # everytime a new private key is generated
+        self.n = random_between(2, self.m - 1)
+        while math.gcd(self.n, self.m) != 1:
+            self.n = random_between(2, self.m - 1)
+        self.public_key = [(self.n * pk_elem) % self.m for pk_elem in self.private_key]
+        self.n_inv = modinv(self.n, self.m)
+
+        # Sums fit int64 for small keys; otherwise fall back to Python ints
+        self.small_sums = sum(self.public_key) < 2**62 and self.m < 2**28
+        self.encryption_tables = chunk_sum_tables(self.public_key, length)
+        if self.small_sums:
+            self.encryption_tables = [np.array(t, dtype=np.int64) for t in self.encryption_tables]
+
+        if length <= TABLE_MAX_LENGTH and self.small_sums:
+            self.block_sums, self.block_values = self.build_decryption_table()
+        else:
+            self.block_sums = self.block_values = None
+            self.decryption_tables = [
+                sorted((chunk_sum, value) for value, chunk_sum in enumerate(table))
+                for table in chunk_sum_tables(self.private_key, length)
+            ]
+
+    def generate_private_key(self, length, increment_bits=None):
+        def increment():
+            if increment_bits is None:
+                return random_between(1, 10)
+            return 1 + secrets.randbits(increment_bits)
+
+        private_key = [increment()]
+        for _ in range(1, length):
+            next_value = sum(private_key) + increment()
+            private_key.append(next_value)
+        return private_key
 
-decrypted_text = knapsack.decrypt(ciphertext)
-print("Decrypted Text:", decrypted_text)
+    def encrypt(self, plaintext):
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode("latin-1")
+        chunks = pack_blocks(plaintext, self.length)
+
+        # One table lookup per 8-bit chunk instead of one addition per bit
+        if self.small_sums:
+            return sum(table[chunks[:, k]] for k, table in enumerate(self.encryption_tables))
+        return np.array(
+            [sum(map(list.__getitem__, self.encryption_tables, row)) for row in chunks.tolist()],
+            dtype=object,
+        )
+
+    def build_decryption_table(self):
+        # Subset sums of a superincreasing key are all distinct, so sorting the
+        # sums of all 2^length blocks gives a lookup from c * n_inv % m back to
+        # the block value
+        length = len(self.private_key)
+        values = np.arange(1 << length, dtype=np.int64)
+        bits = (values[:, None] >> np.arange(length - 1, -1, -1)) & 1
+        sums = bits @ np.array(self.private_key, dtype=np.int64)
+        order = np.argsort(sums)
+        return sums[order], values[order]
+
+    def decrypt_blocks(self, ciphertext):
+        if self.block_sums is None:
+            return self.decrypt_blocks_greedy(ciphertext)
+
+        c_prime = (np.asarray(ciphertext, dtype=np.int64) * self.n_inv) % self.m
+        index = np.searchsorted(self.block_sums, c_prime)
+        index = np.minimum(index, len(self.block_sums) - 1)
+        if not np.array_equal(self.block_sums[index], c_prime):
+            raise ValueError("Ciphertext was not produced with this key")
+        values = self.block_values[index]
+
+        shifts = np.arange(self.length - 1, -1, -1)
+        bits = ((values[:, None] >> shifts) & 1).astype(np.uint8)
+        return np.packbits(bits, axis=1)
+
+    def decrypt_blocks_greedy(self, ciphertext):
+        # Each private key element exceeds the sum of all smaller ones, so
+        # working from the highest 8-bit chunk down, the chunk value is the one
+        # with the largest subset sum that still fits in c_prime
+        chunks = np.zeros((len(ciphertext), len(self.decryption_tables)), dtype=np.uint8)
+        reversed_tables = list(enumerate(self.decryption_tables))[::-1]
+        for row, cipher_block in enumerate(ciphertext):
+            c_prime = (int(cipher_block) * self.n_inv) % self.m
+            for k, table in reversed_tables:
+                chunk_sum, value = table[bisect.bisect_right(table, (c_prime, 256)) - 1]
+                chunks[row, k] = value
+                c_prime -= chunk_sum
+            if c_prime:
+                raise ValueError("Ciphertext was not produced with this key")
+        return chunks
+
+    def decrypt(self, ciphertext, size=None):
+        # size is the plaintext length in bytes; it is only needed when blocks
+        # longer than 8 bits may have padded more than a whole byte
+        chunks = self.decrypt_blocks(ciphertext)
+        # Drop the zero bits encrypt() padded the last block with
+        return unpack_blocks(chunks, self.length, size).decode("latin-1")
+
+
+def benchmark(lengths=(8, 16, 32, 64, 128, 256), message_bytes=1 << 14, increment_bits=16):
+    # Key generation time and encrypt/decrypt throughput as the block grows
+    message = secrets.token_bytes(message_bytes)
+    results = []
+    print(f"{'bits':>5} {'keygen ms':>10} {'encrypt MB/s':>13} {'decrypt MB/s':>13}")
+    for length in lengths:
+        start = time.perf_counter()
+        knapsack = KnapsackCryptosystem(length, increment_bits)
+        keygen = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ciphertext = knapsack.encrypt(message)
+        encrypt_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        decrypted = knapsack.decrypt(ciphertext, len(message))
+        decrypt_time = time.perf_counter() - start
+        assert decrypted.encode("latin-1") == message
+
+        row = (length, keygen * 1000, message_bytes / encrypt_time / 1e6, message_bytes / decrypt_time / 1e6)
+        results.append(row)
+        print(f"{row[0]:>5} {row[1]:>10.2f} {row[2]:>13.3f} {row[3]:>13.3f}")
+    return results
+
+
+if __name__ == "__main__":
+    knapsack = KnapsackCryptosystem()
+
+    plaintext = "Testing a very looong message"
+    print("Original Plaintext:", plaintext)
+
+    ciphertext = knapsack.encrypt(plaintext)
+    print("Ciphertext:", ciphertext)
+
+    decrypted_text = knapsack.decrypt(ciphertext)
+    print("Decrypted Text:", decrypted_text)
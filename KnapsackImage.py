@@ -1,6 +1,14 @@
+import json
 import numpy as np
 import random
-from PIL import Image
+import struct
+
+# Ciphertext file layout: magic, little-endian uint32 header length, JSON
+# header, zero padding to a 64-byte boundary, then the ciphertext in the
+# smallest unsigned dtype that holds sum(public_key)
+CIPHERTEXT_MAGIC = b"KNAPSACK"
+CIPHERTEXT_VERSION = 1
+CIPHERTEXT_ALIGNMENT = 64
 
 def to_binary(pixel_values):
     return "".join(format(val, "08b") for val in pixel_values)
@@ -16,14 +24,35 @@ def modinv(a, m):
         x0, x1 = x1 - q * x0, x0
     return x1 + m0 if x1 < 0 else x1
 
+def smallest_uint_dtype(max_value):
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError("Ciphertext values do not fit in 64 bits")
+
 class KnapsackCryptosystem:
-    def _init_(self, length=8):
-        self.private_key = self.generate_private_key(length)
-        self.m = sum(self.private_key) + random.randint(10, 20)
-        self.n = random.randint(2, self.m - 1)
-        while np.gcd(self.n, self.m) != 1:
-            self.n = random.randint(2, self.m - 1)
+    def __init__(self, length=8, private_key=None, m=None, n=None):
+        # Pass private_key, m and n together to rebuild a saved key (see load_keys)
+        if private_key is None:
+            private_key = self.generate_private_key(length)
+            m = sum(private_key) + random.randint(10, 20)
+            n = random.randint(2, m - 1)
+            while np.gcd(n, m) != 1:
+                n = random.randint(2, m - 1)
+        length = len(private_key)
+        self.private_key = [int(k) for k in private_key]
+        self.m = int(m)
+        self.n = int(n)
         self.public_key = [(self.n * pk_elem) % self.m for pk_elem in self.private_key]
+        # Ciphertext of every possible 8-bit block, indexed by the block value
+        byte_bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)
+        self.cipher_dtype = smallest_uint_dtype(sum(self.public_key))
+        self.encryption_table = (
+            (byte_bits @ np.array(self.public_key, dtype=np.int64)).astype(self.cipher_dtype)
+            if length == 8 else None
+        )
+        self.n_inv = modinv(self.n, self.m)
+        self.block_sums, self.block_values = self.build_decryption_table()
 
     def generate_private_key(self, length):
         private_key = [random.randint(1, 10)]
@@ -33,35 +62,60 @@ class KnapsackCryptosystem:
         return private_key
 
     def encrypt(self, pixel_values):
-        binary_str = to_binary(pixel_values)
-        cipher_blocks = []
-        for i in range(0, len(binary_str), 8):
-            chunk = binary_str[i: i + 8].ljust(8, "0")
-            encrypted_sum = sum(int(bit) * self.public_key[j] for j, bit in enumerate(chunk))
-            cipher_blocks.append(encrypted_sum)
-        return cipher_blocks
-
-    def decrypt(self, ciphertext):
-        n_inv = modinv(self.n, self.m)
-        decrypted_bits = []
-        for cipher_block in ciphertext:
-            c_prime = (cipher_block * n_inv) % self.m
-            bits = ["0"] * len(self.private_key)
-            for i in reversed(range(len(self.private_key))):
-                if self.private_key[i] <= c_prime:
-                    bits[i] = "1"
-                    c_prime -= self.private_key[i]
-            decrypted_bits.append("".join(bits))
-        decrypted_binary_str = "".join(decrypted_bits)
-        return to_decimal(decrypted_binary_str)
+        pixels = np.asarray(pixel_values, dtype=np.uint8).ravel()
+        if self.encryption_table is not None:
+            # 8-bit blocks line up with pixels: one table lookup each
+            return self.encryption_table[pixels]
+
+        # Otherwise split the bit stream into (N, length) blocks, zero-padding
+        # the last one, and take all the knapsack sums in one product
+        length = len(self.public_key)
+        bits = np.unpackbits(pixels)
+        bits = np.pad(bits, (0, -len(bits) % length))
+        sums = bits.reshape(-1, length) @ np.array(self.public_key, dtype=np.int64)
+        return sums.astype(self.cipher_dtype)
+
+    def build_decryption_table(self):
+        # Subset sums of a superincreasing key are all distinct, so sorting the
+        # sums of all 2^length blocks gives a lookup from c * n_inv % m back to
+        # the block value
+        length = len(self.private_key)
+        values = np.arange(1 << length, dtype=np.int64)
+        bits = (values[:, None] >> np.arange(length - 1, -1, -1)) & 1
+        sums = bits @ np.array(self.private_key, dtype=np.int64)
+        order = np.argsort(sums)
+        return sums[order], values[order]
+
+    def decrypt_blocks(self, ciphertext):
+        c_prime = (np.asarray(ciphertext, dtype=np.int64) * self.n_inv) % self.m
+        index = np.searchsorted(self.block_sums, c_prime)
+        index = np.minimum(index, len(self.block_sums) - 1)
+        if not np.array_equal(self.block_sums[index], c_prime):
+            raise ValueError("Ciphertext was not produced with this key")
+        return self.block_values[index]
+
+    def decrypt(self, ciphertext, size=None):
+        # size is the plaintext length in bytes; it is only needed when blocks
+        # longer than 8 bits may have padded more than a whole byte
+        blocks = self.decrypt_blocks(ciphertext)
+        length = len(self.private_key)
+        if length == 8:
+            return blocks.astype(np.uint8)
+        bits = ((blocks[:, None] >> np.arange(length - 1, -1, -1)) & 1).astype(np.uint8)
+        bits = bits.ravel()
+        return np.packbits(bits[: len(bits) // 8 * 8])[:size]
 
 def image_to_pixels(image_path):
+    from PIL import Image
+
     image = Image.open(image_path)
     pixel_values = list(image.getdata())
     flat_pixel_values = [val for sublist in pixel_values for val in sublist]  # Flatten pixels
     return flat_pixel_values, image.size, image.mode
 
 def pixels_to_image(pixel_values, image_size, mode):
+    from PIL import Image
+
     reshaped_pixels = [tuple(pixel_values[i:i + 3]) for i in range(0, len(pixel_values), 3)]
     image = Image.new(mode, image_size)
     image.putdata(reshaped_pixels)
@@ -75,25 +129,80 @@ def encrypted_pixels_to_image(encrypted_values, image_size):
     normalized_values = [int((val - min_value) / (max_value - min_value) * 255) for val in encrypted_values]
     return pixels_to_image(normalized_values, image_size, "RGB")
 
-# Main logic to encrypt and decrypt the image
-knapsack = KnapsackCryptosystem()
-
-# Load the image and convert it to pixel values
-image_path = "nature.jpg"
-pixel_values, image_size, mode = image_to_pixels(image_path)
-
-# Encrypt the pixel values
-ciphertext = knapsack.encrypt(pixel_values)
-
-# Convert ciphertext to a flat list for image conversion
-encrypted_image = encrypted_pixels_to_image(ciphertext, image_size)
-encrypted_image.show()  # Display the encrypted image
-encrypted_image.save("encrypted_image.png")  # Save the encrypted image
-
-# Decrypt the pixel values
-decrypted_pixels = knapsack.decrypt(ciphertext)
-
-# Convert the decrypted pixel values back into an image
-decrypted_image = pixels_to_image(decrypted_pixels, image_size, mode)
-decrypted_image.show()  # Display the decrypted image
-decrypted_image.save("decrypted_image.png")  # Save the decrypted image
\ No newline at end of file
+def save_ciphertext(path, ciphertext, public_key, shape=None, mode=None):
+    """Write ciphertext as raw unsigned integers behind a small JSON header."""
+    dtype = smallest_uint_dtype(sum(public_key)).newbyteorder("<")
+    data = np.ascontiguousarray(ciphertext, dtype=dtype).ravel()
+    header = json.dumps({
+        "version": CIPHERTEXT_VERSION,
+        "public_key": [int(k) for k in public_key],
+        "block_length": len(public_key),
+        "shape": list(shape) if shape is not None else None,
+        "mode": mode,
+        "dtype": dtype.str,
+        "count": len(data),
+    }).encode()
+
+    prefix_length = len(CIPHERTEXT_MAGIC) + 4 + len(header)
+    padding = -prefix_length % CIPHERTEXT_ALIGNMENT
+    with open(path, "wb") as f:
+        f.write(CIPHERTEXT_MAGIC + struct.pack("<I", len(header)) + header + b"\0" * padding)
+        f.write(data.tobytes())
+
+def save_keys(path, knapsack):
+    """Write the private key, modulus and multiplier as a JSON keyfile."""
+    with open(path, "w") as f:
+        json.dump({"private_key": knapsack.private_key, "m": knapsack.m, "n": knapsack.n}, f)
+
+def load_keys(path):
+    with open(path) as f:
+        keys = json.load(f)
+    return KnapsackCryptosystem(private_key=keys["private_key"], m=keys["m"], n=keys["n"])
+
+def load_ciphertext(path, mmap=True):
+    """Return (ciphertext array, header dict); the array is memory-mapped by default."""
+    with open(path, "rb") as f:
+        if f.read(len(CIPHERTEXT_MAGIC)) != CIPHERTEXT_MAGIC:
+            raise ValueError(f"{path} is not a knapsack ciphertext file")
+        (header_length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_length))
+    if header["version"] != CIPHERTEXT_VERSION:
+        raise ValueError(f"Unsupported ciphertext version {header['version']}")
+
+    prefix_length = len(CIPHERTEXT_MAGIC) + 4 + header_length
+    offset = prefix_length + (-prefix_length % CIPHERTEXT_ALIGNMENT)
+    dtype = np.dtype(header["dtype"])
+    if mmap:
+        ciphertext = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(header["count"],))
+    else:
+        ciphertext = np.fromfile(path, dtype=dtype, count=header["count"], offset=offset)
+    return ciphertext, header
+
+if __name__ == "__main__":
+    # Main logic to encrypt and decrypt the image
+    knapsack = KnapsackCryptosystem()
+
+    # Load the image and convert it to pixel values
+    image_path = "nature.jpg"
+    pixel_values, image_size, mode = image_to_pixels(image_path)
+
+    # Encrypt the pixel values
+    ciphertext = knapsack.encrypt(pixel_values)
+
+    # Store the exact ciphertext; the normalized image below is only for viewing
+    save_ciphertext("encrypted_image.knap", ciphertext, knapsack.public_key,
+                    shape=(image_size[1], image_size[0], len(mode)), mode=mode)
+
+    # Convert ciphertext to a flat list for image conversion
+    encrypted_image = encrypted_pixels_to_image(ciphertext, image_size)
+    encrypted_image.show()  # Display the encrypted image
+    encrypted_image.save("encrypted_image.png")  # Save the encrypted image
+
+    # Decrypt the pixel values straight from the memory-mapped ciphertext file
+    ciphertext, header = load_ciphertext("encrypted_image.knap")
+    decrypted_pixels = knapsack.decrypt(ciphertext)
+
+    # Convert the decrypted pixel values back into an image
+    decrypted_image = pixels_to_image(decrypted_pixels, image_size, mode)
+    decrypted_image.show()  # Display the decrypted image
+    decrypted_image.save("decrypted_image.png")  # Save the decrypted image
@@ -1,3 +1,4 @@
+import re
 from pprint import pprint
 
 
@@ -96,6 +97,79 @@ def decrypt_playfair(matrix: list[list[str]], ciphertext: str) -> str:
 
     return ''.join(plaintext).replace("X", "").rstrip()
 
+# One digraph per match: a character plus the next one unless they repeat,
+# exactly the pairing encrypt_playfair builds with its while loop
+DIGRAPH_PATTERN = re.compile(r"(.)((?!\1).)?", re.DOTALL)
+CIPHER_DIGRAPH_PATTERN = re.compile(r"..?", re.DOTALL)
+NORMALIZE_TABLE = str.maketrans({"J": "I", " ": None})
+
+
+def apply_digraph_rule(matrix: list[list[str]], lookup: dict, digraph: str, step: int) -> str:
+    row1, col1 = lookup[digraph[0]]
+    row2, col2 = lookup[digraph[1]]
+
+    if row1 == row2:
+        return matrix[row1][(col1 + step) % 6] + matrix[row2][(col2 + step) % 6]
+    elif col1 == col2:
+        return matrix[(row1 + step) % 5][col1] + matrix[(row2 + step) % 5][col2]
+    else:
+        return matrix[row1][col2] + matrix[row2][col1]
+
+
+class PlayfairCipher:
+    def __init__(self, key: str):
+        self.matrix = generate_matrix(key)
+        self._build_tables()
+
+    @classmethod
+    def from_matrix(cls, matrix: list[list[str]]) -> "PlayfairCipher":
+        cipher = cls.__new__(cls)
+        cipher.matrix = matrix
+        cipher._build_tables()
+        return cipher
+
+    def _build_tables(self) -> None:
+        lookup = {
+            char: (i, j) for i, row in enumerate(self.matrix) for j, char in enumerate(row)
+        }
+        chars = list(lookup)
+
+        # Encryption is keyed by DIGRAPH_PATTERN's (char1, char2) groups, where
+        # an empty char2 stands for the "X" filler; decryption by the raw text
+        # slices, where a lone trailing char is also paired with "X".
+        self.encrypt_table: dict[tuple[str, str], str] = {}
+        self.decrypt_table: dict[str, str] = {}
+        for char1 in chars:
+            self.encrypt_table[char1, ""] = apply_digraph_rule(self.matrix, lookup, char1 + "X", 1)
+            self.decrypt_table[char1] = apply_digraph_rule(self.matrix, lookup, char1 + "X", -1)
+            for char2 in chars:
+                digraph = char1 + char2
+                self.encrypt_table[char1, char2] = apply_digraph_rule(self.matrix, lookup, digraph, 1)
+                self.decrypt_table[digraph] = apply_digraph_rule(self.matrix, lookup, digraph, -1)
+
+    def encrypt(self, plaintext: str) -> str:
+        return self._encrypt_normalized(plaintext.upper().translate(NORMALIZE_TABLE))
+
+    def decrypt(self, ciphertext: str) -> str:
+        return "".join(
+            map(self.decrypt_table.__getitem__, CIPHER_DIGRAPH_PATTERN.findall(ciphertext))
+        ).replace("X", "").rstrip()
+
+    def encrypt_many(self, plaintexts: list[str]) -> list[str]:
+        # Upper-case and normalize every message in one pass over the joined text
+        joined = "\0".join(plaintexts).upper().translate(NORMALIZE_TABLE)
+        normalized = joined.split("\0") if plaintexts else []
+        if len(normalized) != len(plaintexts):
+            normalized = [p.upper().translate(NORMALIZE_TABLE) for p in plaintexts]
+        return [self._encrypt_normalized(text) for text in normalized]
+
+    def decrypt_many(self, ciphertexts: list[str]) -> list[str]:
+        return [self.decrypt(text) for text in ciphertexts]
+
+    def _encrypt_normalized(self, plaintext: str) -> str:
+        return "".join(map(self.encrypt_table.__getitem__, DIGRAPH_PATTERN.findall(plaintext)))
+
+
 if __name__ == "__main__":
     key = "TODAY123"
     plaintext = "ATTACKTONIGHT"
@@ -1,75 +1,148 @@
 from PIL import Image
 from pprint import pprint
+import hashlib
 import numpy as np
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple, Union
 
-def generate_matrix_from_image(key_image_path: str) -> List[List[int]]:
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def first_seen_values(pixels: np.ndarray, chunk_size: int = 1 << 16) -> List[int]:
+    """Distinct values in order of first appearance, stopping once all 256 are seen."""
+    unique_pixels: List[int] = []
+    seen = np.zeros(256, dtype=bool)
+    for start in range(0, len(pixels), chunk_size):
+        values, first_index = np.unique(pixels[start:start + chunk_size], return_index=True)
+        new = ~seen[values]
+        values, first_index = values[new], first_index[new]
+        unique_pixels.extend(values[np.argsort(first_index)].tolist())
+        seen[values] = True
+        if len(unique_pixels) == 256:
+            break
+    return unique_pixels
+
+@lru_cache(maxsize=32)
+def matrix_for_digest(digest: str, key_image_path: str) -> Tuple[Tuple[int, ...], ...]:
+    """Matrix derived from a key image, cached by the SHA-256 of its contents."""
+    # The path only locates the file; an edited key image gets a new digest
     key_img = Image.open(key_image_path).convert('L')  # Convert to grayscale
-    pixels = list(key_img.getdata())
-    unique_pixels = []
-    seen = set()
-    for pixel in pixels:
-        if pixel not in seen and len(unique_pixels) < 256:
-            seen.add(pixel)
-            unique_pixels.append(pixel)
-    
+    unique_pixels = first_seen_values(np.asarray(key_img, dtype=np.uint8).ravel())
+
     if len(unique_pixels) < 256:
-        remaining = [x for x in range(256) if x not in unique_pixels]
-        unique_pixels.extend(remaining[:256-len(unique_pixels)])
-    
-    matrix = [unique_pixels[i*16:(i+1)*16] for i in range(16)]
-    return matrix
+        seen = set(unique_pixels)
+        unique_pixels.extend(x for x in range(256) if x not in seen)
+
+    return tuple(tuple(unique_pixels[i*16:(i+1)*16]) for i in range(16))
+
+def generate_matrix_from_image(key_image_path: str) -> List[List[int]]:
+    matrix = matrix_for_digest(file_digest(key_image_path), key_image_path)
+    return [list(row) for row in matrix]
+
+@lru_cache(maxsize=32)
+def pair_tables(matrix_key: Tuple[Tuple[int, ...], ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """65536-entry pair -> pair encryption and decryption tables for one matrix."""
+    grid = np.array(matrix_key, dtype=np.uint8)
+    rows = np.empty(256, dtype=np.int64)
+    cols = np.empty(256, dtype=np.int64)
+    rows[grid] = np.arange(16)[:, None]
+    cols[grid] = np.arange(16)[None, :]
+
+    # Entry (a << 8) | b holds the output pair for input pair (a, b)
+    pairs = np.arange(65536)
+    row1, col1 = rows[pairs >> 8], cols[pairs >> 8]
+    row2, col2 = rows[pairs & 0xFF], cols[pairs & 0xFF]
+    same_row = row1 == row2
+    same_col = (col1 == col2) & ~same_row
+
+    # Same-row, same-column and rectangle rules as masks over all pairs at once
+    tables = []
+    for step in (1, -1):
+        first = np.where(same_row, grid[row1, (col1 + step) % 16],
+                         np.where(same_col, grid[(row1 + step) % 16, col1], grid[row1, col2]))
+        second = np.where(same_row, grid[row2, (col2 + step) % 16],
+                          np.where(same_col, grid[(row2 + step) % 16, col2], grid[row2, col1]))
+        tables.append(np.stack([first, second], axis=1).astype(np.uint8))
+    return tables[0], tables[1]
+
+def apply_pair_table(table: np.ndarray, pixels: np.ndarray) -> np.ndarray:
+    """Run a flat pixel array through a pair table, padding an odd tail with 0."""
+    if len(pixels) % 2:
+        pixels = np.append(pixels, np.uint8(0))
+    pairs = pixels.reshape(-1, 2).astype(np.intp)
+    return table[(pairs[:, 0] << 8) | pairs[:, 1]].ravel()
+
+def matrix_key(matrix: List[List[int]]) -> Tuple[Tuple[int, ...], ...]:
+    return tuple(tuple(row) for row in matrix)
 
 def encrypt_playfair_image(matrix: List[List[int]], image_path: str) -> Image.Image:
-    lookup = {val: (i, j) for i, row in enumerate(matrix) for j, val in enumerate(row)}
-    
-    img = Image.open(image_path).convert('L') 
+    encrypt_table, _ = pair_tables(matrix_key(matrix))
+
+    img = Image.open(image_path).convert('L')
     width, height = img.size
-    pixels = list(img.getdata())
-    
-    encrypted_pixels = []
-    for i in range(0, len(pixels), 2):
-        pixel1 = pixels[i]
-        pixel2 = pixels[i+1] if i+1 < len(pixels) else 0
-        
-        row1, col1 = lookup[pixel1]
-        row2, col2 = lookup[pixel2]
-        
-        if row1 == row2:
-            encrypted_pixels.extend([matrix[row1][(col1 + 1) % 16], matrix[row2][(col2 + 1) % 16]])
-        elif col1 == col2:
-            encrypted_pixels.extend([matrix[(row1 + 1) % 16][col1], matrix[(row2 + 1) % 16][col2]])
-        else:
-            encrypted_pixels.extend([matrix[row1][col2], matrix[row2][col1]])
-    
-    encrypted_image = Image.new('L', (width, height))
-    encrypted_image.putdata(encrypted_pixels)
-    return encrypted_image
+    pixels = np.asarray(img, dtype=np.uint8).ravel()
+
+    encrypted_pixels = playfair_channel(encrypt_table, pixels)
+    return Image.fromarray(encrypted_pixels.reshape(height, width))
 
 def decrypt_playfair_image(matrix: List[List[int]], encrypted_image: Image.Image) -> Image.Image:
-    lookup = {val: (i, j) for i, row in enumerate(matrix) for j, val in enumerate(row)}
-    
+    _, decrypt_table = pair_tables(matrix_key(matrix))
+
     width, height = encrypted_image.size
-    pixels = list(encrypted_image.getdata())
-    
-    decrypted_pixels = []
-    for i in range(0, len(pixels), 2):
-        pixel1 = pixels[i]
-        pixel2 = pixels[i+1] if i+1 < len(pixels) else 0
-        
-        row1, col1 = lookup[pixel1]
-        row2, col2 = lookup[pixel2]
-        
-        if row1 == row2:
-            decrypted_pixels.extend([matrix[row1][(col1 - 1) % 16], matrix[row2][(col2 - 1) % 16]])
-        elif col1 == col2:
-            decrypted_pixels.extend([matrix[(row1 - 1) % 16][col1], matrix[(row2 - 1) % 16][col2]])
-        else:
-            decrypted_pixels.extend([matrix[row1][col2], matrix[row2][col1]])
-    
-    decrypted_image = Image.new('L', (width, height))
-    decrypted_image.putdata(decrypted_pixels)
-    return decrypted_image
+    pixels = np.asarray(encrypted_image.convert('L'), dtype=np.uint8).ravel()
+
+    decrypted_pixels = playfair_channel(decrypt_table, pixels)
+    return Image.fromarray(decrypted_pixels.reshape(height, width))
+
+Matrix = List[List[int]]
+
+def playfair_channel(table: np.ndarray, channel: np.ndarray) -> np.ndarray:
+    """Run one channel through a pair table without losing an odd last pixel."""
+    flat = channel.ravel()
+    if len(flat) % 2 == 0:
+        return apply_pair_table(table, flat)
+    # An odd last pixel is paired with itself: the same-row rule maps (p, p)
+    # to (q, q) and back, so it survives decryption
+    last = apply_pair_table(table, np.repeat(flat[-1:], 2))[:1]
+    return np.concatenate([apply_pair_table(table, flat[:-1]), last])
+
+def playfair_pixels(pixels: np.ndarray, matrices: Union[Matrix, Sequence[Matrix]],
+                    decrypt: bool = False, workers: Optional[int] = None) -> np.ndarray:
+    """Encrypt or decrypt an (H, W) or (H, W, C) uint8 array channel by channel."""
+    planes = pixels[..., None] if pixels.ndim == 2 else pixels
+    channels = planes.shape[2]
+    # One matrix shared by every channel, or one matrix per channel
+    if np.ndim(matrices) == 2:
+        matrices = [matrices] * channels
+    elif len(matrices) != channels:
+        raise ValueError(f"Expected 1 or {channels} key matrices, got {len(matrices)}")
+
+    tables = [pair_tables(matrix_key(matrix))[1 if decrypt else 0] for matrix in matrices]
+    # Channels run concurrently; the NumPy gathers release the GIL
+    with ThreadPoolExecutor(max_workers=workers or channels) as pool:
+        results = list(pool.map(
+            lambda index: playfair_channel(tables[index], planes[..., index]),
+            range(channels),
+        ))
+
+    return np.stack(results, axis=1).reshape(pixels.shape)
+
+def encrypt_playfair_color_image(matrices: Union[Matrix, Sequence[Matrix]], image_path: str,
+                                 workers: Optional[int] = None) -> Image.Image:
+    img = Image.open(image_path)
+    if img.mode not in ('L', 'RGB', 'RGBA'):
+        img = img.convert('RGB')
+    return Image.fromarray(playfair_pixels(np.asarray(img, dtype=np.uint8), matrices, workers=workers))
+
+def decrypt_playfair_color_image(matrices: Union[Matrix, Sequence[Matrix]], encrypted_image: Image.Image,
+                                 workers: Optional[int] = None) -> Image.Image:
+    pixels = np.asarray(encrypted_image, dtype=np.uint8)
+    return Image.fromarray(playfair_pixels(pixels, matrices, decrypt=True, workers=workers))
 
 if __name__ == "__main__":
     key_image_path = "keyimage.jpg"
@@ -1,6 +1,9 @@
 import hashlib
+import os
+import time
+from functools import lru_cache
+
 import numpy as np
-from PIL import Image
 
 
 def permute(bits, perm):
@@ -105,7 +108,7 @@ def sdes_key_generation(key_10bit):
 
 
 def encrypt_text(text, key_10bit):
-    key1, key2 = sdes_key_generation(key_10bit)
+    key1, key2 = get_cipher(key_10bit).subkeys
 
     blocks = [text[i : i + 8] for i in range(0, len(text), 8)]
     encrypted_blocks = [encrypt_block(block, key1, key2) for block in blocks]
@@ -142,7 +145,7 @@ def decrypt_block(block, k1, k2):
 
 
 def decrypt_text(encrypted_text, key_10bit):
-    key1, key2 = sdes_key_generation(key_10bit)
+    key1, key2 = get_cipher(key_10bit).subkeys
 
     # Ensure encrypted text is in bits
     encrypted_bits = to_bits(encrypted_text)
@@ -154,7 +157,463 @@ def decrypt_text(encrypted_text, key_10bit):
     return from_bits([int(b) for block in decrypted_blocks for b in block])
 
 
+def build_byte_tables(k1, k2):
+    # S-DES is a permutation of the 256 byte values for a fixed (k1, k2),
+    # so one pass of encrypt_block per byte value describes the whole cipher.
+    encrypt_table = bytes(
+        int(encrypt_block(f"{value:08b}", k1, k2), 2) for value in range(256)
+    )
+
+    decrypt_table = bytearray(256)
+    for value, encrypted in enumerate(encrypt_table):
+        decrypt_table[encrypted] = value
+
+    return encrypt_table, bytes(decrypt_table)
+
+
+def apply_byte_table(data, table):
+    # NumPy pixel buffers stay arrays; anything else bytes-like comes back as bytes
+    if isinstance(data, np.ndarray):
+        if data.dtype != np.uint8:
+            raise ValueError("S-DES operates on uint8 arrays.")
+        return np.frombuffer(table, dtype=np.uint8)[data]
+    if not isinstance(data, bytes):
+        data = memoryview(data).tobytes()
+    return data.translate(table)
+
+
+class SDESCipher:
+    def __init__(self, key_10bit):
+        # Subkeys are tuples and tables are bytes, so one instance can be
+        # shared between threads (see get_cipher)
+        self.k1, self.k2 = map(tuple, sdes_key_generation(key_10bit))
+        self.encrypt_table, self.decrypt_table = build_byte_tables(self.k1, self.k2)
+
+    @property
+    def subkeys(self):
+        return self.k1, self.k2
+
+    def encrypt(self, data):
+        # One table lookup per byte, done in C by bytes.translate / NumPy indexing
+        return apply_byte_table(data, self.encrypt_table)
+
+    def decrypt(self, data):
+        return apply_byte_table(data, self.decrypt_table)
+
+    def encryptor(self, mode):
+        return mode.create_context(self, decrypting=False)
+
+    def decryptor(self, mode):
+        return mode.create_context(self, decrypting=True)
+
+
+# Block cipher modes. S-DES has an 8-bit block, so IVs and nonces are single
+# byte values and the CTR/OFB keystreams repeat after at most 256 bytes.
+def block_value(value):
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) != 1:
+            raise ValueError("S-DES blocks are a single byte.")
+        value = value[0]
+    if not 0 <= value < 256:
+        raise ValueError("S-DES blocks are a single byte.")
+    return value
+
+
+def tile_keystream(period, start, length):
+    # Keystream bytes start .. start + length of a stream that repeats `period`
+    return np.resize(np.roll(period, -(start % len(period))), length)
+
+
+def as_uint8(data):
+    # Flat uint8 view of the data; arrays are checked like apply_byte_table
+    # does, copied only if they are not contiguous
+    if isinstance(data, np.ndarray):
+        if data.dtype != np.uint8:
+            raise ValueError("S-DES operates on uint8 arrays.")
+        return np.ascontiguousarray(data).ravel()
+    return np.frombuffer(memoryview(data).cast("B"), dtype=np.uint8)
+
+
+class ModeContext:
+    def __init__(self):
+        self._finalized = False
+
+    def update(self, data):
+        if self._finalized:
+            raise ValueError("Context was already finalized.")
+        data = as_uint8(data)
+        if len(data) == 0:
+            return b""
+        return self._process(data)
+
+    def finalize(self):
+        if self._finalized:
+            raise ValueError("Context was already finalized.")
+        self._finalized = True
+        # Every mode works on whole bytes, so nothing is ever held back
+        return b""
+
+
+class CBCContext(ModeContext):
+    def __init__(self, cipher, iv, decrypting):
+        super().__init__()
+        self._cipher = cipher
+        self._previous = iv
+        self._decrypting = decrypting
+
+    def _process(self, data):
+        if self._decrypting:
+            # Each plaintext byte only depends on two ciphertext bytes
+            previous = np.empty_like(data)
+            previous[0] = self._previous
+            previous[1:] = data[:-1]
+            decrypted = np.frombuffer(self._cipher.decrypt_table, dtype=np.uint8)[data]
+            self._previous = int(data[-1])
+            return (decrypted ^ previous).tobytes()
+
+        table = self._cipher.encrypt_table
+        previous = self._previous
+        encrypted = bytearray(len(data))
+        for i, value in enumerate(data.tobytes()):
+            previous = table[value ^ previous]
+            encrypted[i] = previous
+        self._previous = previous
+        return bytes(encrypted)
+
+
+class KeystreamContext(ModeContext):
+    def __init__(self, period, position=0):
+        super().__init__()
+        self._period = period
+        self._position = position
+
+    def _process(self, data):
+        keystream = tile_keystream(self._period, self._position, len(data))
+        self._position += len(data)
+        return (data ^ keystream).tobytes()
+
+
+class CTRContext(KeystreamContext):
+    def seek(self, offset):
+        # Counter blocks are independent, so any byte offset can be decrypted directly
+        self._position = offset
+
+
+class CBC:
+    def __init__(self, iv):
+        self.iv = block_value(iv)
+
+    def create_context(self, cipher, decrypting):
+        return CBCContext(cipher, self.iv, decrypting)
+
+
+class CTR:
+    def __init__(self, nonce, offset=0):
+        self.nonce = block_value(nonce)
+        self.offset = offset
+
+    def keystream_period(self, cipher):
+        counters = (self.nonce + np.arange(256)) & 0xFF
+        return np.frombuffer(cipher.encrypt_table, dtype=np.uint8)[counters]
+
+    def create_context(self, cipher, decrypting):
+        return CTRContext(self.keystream_period(cipher), self.offset)
+
+
+class OFB:
+    def __init__(self, iv):
+        self.iv = block_value(iv)
+
+    def keystream_period(self, cipher):
+        # Feeding the output back walks the permutation cycle that contains the IV
+        period = [cipher.encrypt_table[self.iv]]
+        while period[-1] != self.iv:
+            period.append(cipher.encrypt_table[period[-1]])
+        return np.array(period, dtype=np.uint8)
+
+    def create_context(self, cipher, decrypting):
+        return KeystreamContext(self.keystream_period(cipher))
+
+
+def process_stream(context, source, destination, chunk_size=1 << 20):
+    # Streams a file object through an encryptor/decryptor with bounded memory
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        destination.write(context.update(chunk))
+    destination.write(context.finalize())
+
+
+# Below this size the process pool costs more than it saves
+PARALLEL_CTR_MIN_BYTES = 1 << 20
+
+
+def ctr_xor_range(shm_name, size, period, offset, start, stop):
+    # Worker: XOR the keystream for [start, stop) into the shared buffer in place
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        buffer = np.ndarray((size,), dtype=np.uint8, buffer=shm.buf)
+        buffer[start:stop] ^= tile_keystream(period, offset + start, stop - start)
+        del buffer
+    finally:
+        shm.close()
+
+
+def ctr_crypt(cipher, data, nonce, offset=0, parallel=None, executor=None):
+    # CTR encryption and decryption are the same operation. With parallel=N the
+    # buffer is split into N ranges whose keystreams are applied by a process
+    # pool directly in shared memory; pass executor to reuse a pool across calls.
+    mode = CTR(nonce, offset)
+    data = as_uint8(data)
+    if not parallel or parallel < 2 or len(data) < PARALLEL_CTR_MIN_BYTES:
+        return cipher.encryptor(mode).update(data)
+
+    # Process pools and shared memory are only imported on the parallel path
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    period = mode.keystream_period(cipher)
+    size = len(data)
+    step = -(-size // parallel)
+
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        buffer = np.ndarray((size,), dtype=np.uint8, buffer=shm.buf)
+        buffer[:] = data
+
+        pool = executor or ProcessPoolExecutor(max_workers=parallel)
+        try:
+            futures = [
+                pool.submit(
+                    ctr_xor_range, shm.name, size, period, offset, start, min(start + step, size)
+                )
+                for start in range(0, size, step)
+            ]
+            for future in futures:
+                future.result()
+        finally:
+            if executor is None:
+                pool.shutdown()
+
+        result = buffer.tobytes()
+        del buffer
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return result
+
+
+def key_to_int(key_10bit):
+    # Accepts "1010000010", [1, 0, 1, ...] or an int in range(1024)
+    if isinstance(key_10bit, int):
+        key = key_10bit
+    else:
+        bits = [int(b) for b in key_10bit]
+        if len(bits) != 10 or any(b not in (0, 1) for b in bits):
+            raise ValueError("S-DES keys are 10 bits.")
+        key = int("".join(map(str, bits)), 2)
+    if not 0 <= key < 1 << 10:
+        raise ValueError("S-DES keys are 10 bits.")
+    return key
+
+
+@lru_cache(maxsize=256)
+def cached_cipher(key):
+    return SDESCipher(f"{key:010b}")
+
+
+def get_cipher(key_10bit):
+    # Keyed ciphers are shared through a bounded LRU cache so repeated keys skip
+    # the key schedule and table build; cached_cipher.cache_info() reports the
+    # hit/miss counters and cached_cipher.cache_clear() empties it.
+    return cached_cipher(key_to_int(key_10bit))
+
+
+def encrypt_bytes(data, key_10bit):
+    return get_cipher(key_10bit).encrypt(data)
+
+
+def decrypt_bytes(data, key_10bit):
+    return get_cipher(key_10bit).decrypt(data)
+
+
+def to_bit_matrix(data):
+    # (N, 8) matrix of bits, most significant bit first like to_bits
+    return np.unpackbits(np.asarray(data, dtype=np.uint8).reshape(-1, 1), axis=1)
+
+
+def f_function_np(right, key, ep=EP, s0=S0, s1=S1, p4=P4):
+    # Same steps as f_function, applied to every row of an (N, 4) bit matrix
+    xor_result = right[:, ep] ^ np.asarray(key, dtype=np.uint8)
+
+    row_s0 = (xor_result[:, 0] << 1) | xor_result[:, 3]
+    col_s0 = (xor_result[:, 1] << 1) | xor_result[:, 2]
+    s0_result = np.asarray(s0, dtype=np.uint8)[row_s0, col_s0]
+
+    row_s1 = (xor_result[:, 4] << 1) | xor_result[:, 7]
+    col_s1 = (xor_result[:, 5] << 1) | xor_result[:, 6]
+    s1_result = np.asarray(s1, dtype=np.uint8)[row_s1, col_s1]
+
+    sbox_output = np.stack(
+        [(s0_result >> 1) & 1, s0_result & 1, (s1_result >> 1) & 1, s1_result & 1],
+        axis=1,
+    )
+    return sbox_output[:, p4]
+
+
+def feistel_np(data, round_keys, ip=IP, ip1=IP1, **f_tables):
+    # Runs len(round_keys) Feistel rounds over all blocks at once, swapping
+    # halves between rounds. f_tables may override ep, s0, s1 and p4.
+    data = np.asarray(data, dtype=np.uint8)
+    bits = to_bit_matrix(data)[:, ip]
+
+    left, right = bits[:, :4], bits[:, 4:]
+    for round_number, key in enumerate(round_keys):
+        left = left ^ f_function_np(right, key, **f_tables)
+        if round_number < len(round_keys) - 1:
+            left, right = right, left
+
+    combined = np.concatenate([left, right], axis=1)[:, ip1]
+    return np.packbits(combined, axis=1).reshape(data.shape)
+
+
+def encrypt_array(data, k1, k2):
+    return feistel_np(data, [k1, k2])
+
+
+def decrypt_array(data, k1, k2):
+    return feistel_np(data, [k2, k1])
+
+
+# Key recovery. The whole 10-bit key space is small enough to tabulate.
+KEY_SPACE = 1 << 10
+
+
+def key_to_bits(key):
+    return f"{key:010b}"
+
+
+@lru_cache(maxsize=1)
+def all_key_tables():
+    # (1024, 256) forward and inverse byte tables, one row per 10-bit key
+    values = np.arange(256, dtype=np.uint8)
+    encrypt_tables = np.empty((KEY_SPACE, 256), dtype=np.uint8)
+    for key in range(KEY_SPACE):
+        encrypt_tables[key] = encrypt_array(values, *sdes_key_generation(key_to_bits(key)))
+    decrypt_tables = np.argsort(encrypt_tables, axis=1).astype(np.uint8)
+    return encrypt_tables, decrypt_tables
+
+
+def search_keys(plaintext, ciphertext, keys, batch_size=16):
+    # Filters candidate keys against the known pairs a batch at a time and
+    # stops as soon as no candidate survives.
+    encrypt_tables = all_key_tables()[0]
+    candidates = np.asarray(keys, dtype=np.int64)
+    for start in range(0, len(plaintext), batch_size):
+        plain = plaintext[start : start + batch_size]
+        cipher = ciphertext[start : start + batch_size]
+        matches = (encrypt_tables[candidates[:, None], plain] == cipher).all(axis=1)
+        candidates = candidates[matches]
+        if len(candidates) == 0:
+            break
+    return candidates.tolist()
+
+
+def recover_key(plaintext, ciphertext, parallel=None, executor=None):
+    # Returns every 10-bit key (as a bit string) consistent with the known
+    # plaintext/ciphertext pair; equivalent keys share the same subkeys.
+    plaintext, ciphertext = as_uint8(plaintext), as_uint8(ciphertext)
+    if len(plaintext) != len(ciphertext):
+        raise ValueError("Plaintext and ciphertext must be the same length.")
+
+    if not parallel or parallel < 2:
+        keys = search_keys(plaintext, ciphertext, range(KEY_SPACE))
+        return [key_to_bits(key) for key in keys]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    all_key_tables()  # build once here so forked workers inherit the tables
+    key_ranges = np.array_split(np.arange(KEY_SPACE), parallel)
+    pool = executor or ProcessPoolExecutor(max_workers=parallel)
+    try:
+        results = pool.map(
+            search_keys,
+            [plaintext] * parallel,
+            [ciphertext] * parallel,
+            key_ranges,
+        )
+        keys = [key for found in results for key in found]
+    finally:
+        if executor is None:
+            pool.shutdown()
+    return [key_to_bits(key) for key in keys]
+
+
+def byte_entropy(blocks):
+    # Shannon entropy in bits of each row of a (K, N) uint8 matrix
+    rows = np.arange(len(blocks))[:, None] * 256
+    counts = np.bincount((rows + blocks).ravel(), minlength=len(blocks) * 256)
+    probabilities = counts.reshape(len(blocks), 256) / blocks.shape[1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(probabilities > 0, probabilities * np.log2(probabilities), 0)
+    return -terms.sum(axis=1)
+
+
+def difference_entropy(blocks):
+    # ECB decryption under any key only permutes byte values, so plain byte
+    # entropy cannot separate keys; neighbouring pixels of a real image are
+    # correlated, which keeps the entropy of their differences low.
+    return byte_entropy(np.diff(blocks, axis=1))
+
+
+def rank_keys(ciphertext, score=difference_entropy, sample_size=1 << 14, batch_size=64):
+    # Ciphertext-only search: decrypt a sample under every key in batches and
+    # return (score, key) pairs, lowest score (most plausible) first.
+    sample = as_uint8(ciphertext)[:sample_size]
+    decrypt_tables = all_key_tables()[1]
+    scores = np.empty(KEY_SPACE)
+    for start in range(0, KEY_SPACE, batch_size):
+        decrypted = decrypt_tables[start : start + batch_size][:, sample]
+        scores[start : start + batch_size] = score(decrypted)
+    order = np.argsort(scores, kind="stable")
+    return [(float(scores[key]), key_to_bits(key)) for key in order]
+
+
+def benchmark_key_search(sample_size=64, repeats=20, workers=None):
+    # Keys per second for an exhaustive known-plaintext search, single-core
+    # and across a process pool. Every run tests each of the 1024 keys.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count()
+    all_key_tables()
+    plaintext = np.frombuffer(os.urandom(sample_size), dtype=np.uint8)
+    ciphertext = plaintext ^ 0xFF
+
+    results = {}
+    start = time.perf_counter()
+    for _ in range(repeats):
+        recover_key(plaintext, ciphertext)
+    results["single"] = KEY_SPACE * repeats / (time.perf_counter() - start)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        recover_key(plaintext, ciphertext, parallel=workers, executor=pool)  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            recover_key(plaintext, ciphertext, parallel=workers, executor=pool)
+        results[f"pool x{workers}"] = KEY_SPACE * repeats / (time.perf_counter() - start)
+
+    for name, keys_per_second in results.items():
+        print(f"{name}: {keys_per_second:,.0f} keys/s")
+    return results
+
+
 def image_to_text(image_path):
+    from PIL import Image
+
     # Open the image and convert to grayscale
     image = Image.open(image_path).convert("L")  # 'L' mode converts to grayscale
 
@@ -171,6 +630,8 @@ def image_to_text(image_path):
 
 
 def text_to_image(text, shape, output_path):
+    from PIL import Image
+
     # Convert text back to pixel values
     pixel_values = [ord(char) for char in text]
     
@@ -188,16 +649,30 @@ def text_to_image(text, shape, output_path):
     image.save(output_path)
     print(f"Image saved to {output_path}")
 
-# Example usage
-key_10bit = "1010000010"  # Example 10-bit key
-# text = hashlib.sha256(input("Enter Input: ").encode()).hexdigest()
 
-img = image_to_text("nature.jpg")
+def image_to_array(image_path):
+    from PIL import Image
+
+    # Grayscale pixels as a uint8 array, ready for encrypt_bytes/decrypt_bytes
+    return np.asarray(Image.open(image_path).convert("L"), dtype=np.uint8)
+
+
+def array_to_image(image_array, output_path):
+    from PIL import Image
+
+    image = Image.fromarray(np.asarray(image_array, dtype=np.uint8))
+    image.save(output_path)
+    print(f"Image saved to {output_path}")
+
+if __name__ == "__main__":
+    # Example usage
+    key_10bit = "1010000010"  # Example 10-bit key
+    # text = hashlib.sha256(input("Enter Input: ").encode()).hexdigest()
 
+    img = image_to_array("nature.jpg")
 
-binary_text = to_bits(img[0])
-encrypted_text = encrypt_text(binary_text, key_10bit)
-text_to_image(encrypted_text,img[1],"SDES_encrypted.jpg")
+    encrypted_img = encrypt_bytes(img, key_10bit)
+    array_to_image(encrypted_img, "SDES_encrypted.jpg")
 
-decrypted_text = decrypt_text(encrypted_text, key_10bit)
-text_to_image(decrypted_text,img[1],"SDES_decrypted.jpg")
+    decrypted_img = decrypt_bytes(encrypted_img, key_10bit)
+    array_to_image(decrypted_img, "SDES_decrypted.jpg")
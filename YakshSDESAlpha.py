@@ -1,4 +1,6 @@
 import random
+from collections import namedtuple
+from functools import lru_cache
 
 # Permutation Tables and S-Boxes
 PermutationP10 = [3, 5, 2, 7, 4, 10, 1, 9, 8, 6]
@@ -10,9 +12,9 @@ Inverse_of_Inital_Permutation_IP_inv = [4, 1, 3, 5, 7, 2, 8, 6]
 S_Box_0 = [[1, 0, 3, 2], [3, 2, 1, 0], [0, 2, 1, 3], [3, 1, 3, 2]]
 S_Box_1 = [[0, 1, 2, 3], [2, 0, 1, 3], [3, 0, 1, 0], [2, 1, 0, 3]]
 
-# Variables to store generated 8-bit keys
-key1_8bits = [0] * 8
-key2_8bits = [0] * 8
+# Generated 8-bit subkeys for one 10-bit key. Immutable, so a schedule can be
+# shared between threads instead of living in module globals.
+KeySchedule = namedtuple("KeySchedule", ["key1_8bits", "key2_8bits"])
 
 def binary(value, bits=8):
     return format(value, f'0{bits}b')
@@ -54,33 +56,80 @@ def function_(bits, key):
 
     return left_4bits + right_4bits
 
-def decryption_of_ciphertext(ciphertext_binary):
-    tmp = permute(ciphertext_binary, Initial_Permutation_IP)
-    print("Decryption - After Initial Permutation:", ''.join(map(str, tmp)))
-
-    arr1 = function_(tmp, key2_8bits)
-    print("Decryption - After Function with Key2:", ''.join(map(str, arr1)))
+# One traced step of a block: direction is "Encryption" or "Decryption",
+# stage is one of "IP", "F(k1)", "F(k2)", "swap", "IP-1"
+TraceEvent = namedtuple("TraceEvent", ["direction", "stage", "bits"])
+
+STAGE_LABELS = {
+    "IP": "Initial Permutation",
+    "F(k1)": "Function with Key1",
+    "F(k2)": "Function with Key2",
+    "swap": "Swap",
+    "IP-1": "Inverse Initial Permutation",
+}
+
+def print_trace(event):
+    print(f"{event.direction} - After {STAGE_LABELS[event.stage]}:", ''.join(map(str, event.bits)))
+
+def feistel_rounds(block_binary, first_key, second_key, stages, direction, trace=None):
+    # Silent unless a trace callback is given; it receives a TraceEvent per step
+    tmp = permute(block_binary, Initial_Permutation_IP)
+    if trace:
+        trace(TraceEvent(direction, "IP", tuple(tmp)))
+
+    arr1 = function_(tmp, first_key)
+    if trace:
+        trace(TraceEvent(direction, stages[0], tuple(arr1)))
     after_swap = swap_bits(arr1, len(arr1) // 2)
-    print("Decryption - After Swap:", ''.join(map(str, after_swap)))
-
-    arr2 = function_(after_swap, key1_8bits)
-    print("Decryption - After Function with Key1:", ''.join(map(str, arr2)))
-
-    return permute(arr2, Inverse_of_Inital_Permutation_IP_inv)
-
-def encryption_of_plaintext(plaintext_binary):
-    tmp = permute(plaintext_binary, Initial_Permutation_IP)
-    print("Encryption - After Initial Permutation:", ''.join(map(str, tmp)))
-
-    arr1 = function_(tmp, key1_8bits)
-    print("Encryption - After Function with Key1:", ''.join(map(str, arr1)))
-    after_swap = swap_bits(arr1, len(arr1) // 2)
-    print("Encryption - After Swap:", ''.join(map(str, after_swap)))
-
-    arr2 = function_(after_swap, key2_8bits)
-    print("Encryption - After Function with Key2:", ''.join(map(str, arr2)))
-
-    return permute(arr2, Inverse_of_Inital_Permutation_IP_inv)
+    if trace:
+        trace(TraceEvent(direction, "swap", tuple(after_swap)))
+
+    arr2 = function_(after_swap, second_key)
+    if trace:
+        trace(TraceEvent(direction, stages[1], tuple(arr2)))
+
+    result = permute(arr2, Inverse_of_Inital_Permutation_IP_inv)
+    if trace:
+        trace(TraceEvent(direction, "IP-1", tuple(result)))
+    return result
+
+def decryption_of_ciphertext(ciphertext_binary, keys, trace=None):
+    return feistel_rounds(ciphertext_binary, keys.key2_8bits, keys.key1_8bits,
+                          ("F(k2)", "F(k1)"), "Decryption", trace)
+
+def encryption_of_plaintext(plaintext_binary, keys, trace=None):
+    return feistel_rounds(plaintext_binary, keys.key1_8bits, keys.key2_8bits,
+                          ("F(k1)", "F(k2)"), "Encryption", trace)
+
+@lru_cache(maxsize=256)
+def byte_tables(keys):
+    # Every byte value run once through the same block functions as above
+    encrypt_table = bytes(
+        binary_to_decimal(encryption_of_plaintext(decimal_to_binary(value), keys))
+        for value in range(256)
+    )
+    decrypt_table = bytes(
+        binary_to_decimal(decryption_of_ciphertext(decimal_to_binary(value), keys))
+        for value in range(256)
+    )
+    return encrypt_table, decrypt_table
+
+def process_message(message, keys, block_function, table, trace=None):
+    if isinstance(message, str):
+        message = message.encode('latin-1')
+    if trace is None:
+        return bytes(message).translate(table)
+    return bytes(
+        binary_to_decimal(block_function(decimal_to_binary(value), keys, trace))
+        for value in message
+    )
+
+def encrypt_message(message, keys, trace=None):
+    # Whole-buffer API: table lookups when silent, block by block when traced
+    return process_message(message, keys, encryption_of_plaintext, byte_tables(keys)[0], trace)
+
+def decrypt_message(ciphertext, keys, trace=None):
+    return process_message(ciphertext, keys, decryption_of_ciphertext, byte_tables(keys)[1], trace)
 
 def decimal_to_binary(decimal):
     return [int(x) for x in format(decimal, '08b')]
@@ -89,6 +138,11 @@ def shift(binary, n):
     return binary[n:] + binary[:n]
 
 def key_generation(key_10bit):
+    return cached_key_generation(tuple(key_10bit))
+
+@lru_cache(maxsize=256)
+def cached_key_generation(key_10bit):
+    # Bounded LRU cache of schedules; cache_info() gives the hit/miss counters
     key_ = permute(key_10bit, PermutationP10)
     left_side = key_[:5]
     right_side = key_[5:]
@@ -96,17 +150,14 @@ def key_generation(key_10bit):
     left_shift1 = shift(left_side, 1)
     right_shift1 = shift(right_side, 1)
     key_1 = left_shift1 + right_shift1
-    global key1_8bits
     key1_8bits = permute(key_1, PermutationP8)
 
     left_shift2 = shift(left_side, 2)
     right_shift2 = shift(right_side, 2)
     key_2 = left_shift2 + right_shift2
-    global key2_8bits
     key2_8bits = permute(key_2, PermutationP8)
 
-    print(f"Generated 8-Bit Key1 (K1): {''.join(map(str, key1_8bits))}")
-    print(f"Generated 8-Bit Key2 (K2): {''.join(map(str, key2_8bits))}")
+    return KeySchedule(tuple(key1_8bits), tuple(key2_8bits))
 
 def generate_random_key(size_of_key):
     return [random.randint(0, 1) for _ in range(size_of_key)]
@@ -116,7 +167,9 @@ def solve():
 
     print(f"Generated 10-Bit Key: {''.join(map(str, key_10bit))}")
 
-    key_generation(key_10bit)
+    keys = key_generation(key_10bit)
+    print(f"Generated 8-Bit Key1 (K1): {''.join(map(str, keys.key1_8bits))}")
+    print(f"Generated 8-Bit Key2 (K2): {''.join(map(str, keys.key2_8bits))}")
 
     plaintext = input("Enter Message: ")
     print(f"Plaintext: {''.join(map(str, decimal_to_binary(ord(plaintext[0]))))}")
@@ -125,7 +178,7 @@ def solve():
     for char in plaintext:
         binary_of_plaintext = decimal_to_binary(ord(char))
         print(f"Original Binary of '{char}': {''.join(map(str, binary_of_plaintext))}")
-        cipher_text_8bits = encryption_of_plaintext(binary_of_plaintext)
+        cipher_text_8bits = encryption_of_plaintext(binary_of_plaintext, keys, trace=print_trace)
         print(f"Encrypted Binary of '{char}': {''.join(map(str, cipher_text_8bits))}")
         ct = binary_to_decimal(cipher_text_8bits)
         cipher_text.append(ct)
@@ -135,7 +188,7 @@ def solve():
     decrypted_text = ''
     for ct in cipher_text:
         cipher_text_8bits = decimal_to_binary(ct)
-        decrypted_8bits = decryption_of_ciphertext(cipher_text_8bits)
+        decrypted_8bits = decryption_of_ciphertext(cipher_text_8bits, keys, trace=print_trace)
         decrypted_text += chr(binary_to_decimal(decrypted_8bits))
 
     print(f"Decrypted Plaintext: {decrypted_text}")
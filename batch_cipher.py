@@ -0,0 +1,265 @@
+"""Encrypt or decrypt a batch of images with one of the image ciphers.
+
+Runs headless: nothing is shown and nothing is read from stdin. Examples:
+
+    python batch_cipher.py shift 42 encrypt images/ -o out/
+    python batch_cipher.py sdes 1010000010 decrypt "out/*_encrypted.png"
+    python batch_cipher.py hill key_matrix.txt encrypt images/ --workers 8
+    python batch_cipher.py playfair keyimage.jpg encrypt "*.jpg"
+    python batch_cipher.py knapsack knapsack_key.json encrypt images/ --verify
+
+Keys per algorithm:
+    shift     integer shift
+    sdes      10-bit key such as 1010000010
+    hill      text (np.loadtxt) or .npy file holding an invertible matrix mod 256
+    playfair  key image the 16x16 matrix is derived from
+    knapsack  JSON keyfile; created with a fresh key when encrypting and missing
+
+Encrypted images are written as PNG so decryption sees the exact pixels;
+knapsack ciphertexts go to .knap files. Hill ciphertexts keep the padding
+rows of their last band and record the original height, which decryption
+crops back to.
+"""
+import argparse
+import glob
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Never open plot windows on a batch node, even if a module pulls in pyplot
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import numpy as np
+
+ALGORITHMS = ("shift", "sdes", "hill", "playfair", "knapsack")
+# Module each algorithm's cipher_* function imports
+CIPHER_MODULES = {
+    "shift": "Cypher",
+    "sdes": "SDES",
+    "hill": "HillCipher",
+    "playfair": "PlayFairImage",
+    "knapsack": "KnapsackImage",
+}
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".gif", ".webp")
+
+
+def load_pixels(path):
+    from PIL import Image
+
+    img = Image.open(path)
+    if img.mode not in ("L", "RGB", "RGBA"):
+        img = img.convert("RGB")
+    return np.asarray(img, dtype=np.uint8)
+
+
+def output_path(path, mode, output_dir, extension=".png"):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    directory = output_dir or os.path.dirname(path)
+    return os.path.join(directory, stem + ("_encrypted" if mode == "encrypt" else "_decrypted") + extension)
+
+
+def cipher_shift(path, key, mode, output_dir):
+    from Cypher import apply_cipher
+    from PIL import Image
+
+    img = Image.open(path)
+    result = apply_cipher(img, int(key), mode)
+    target = output_path(path, mode, output_dir)
+    result.save(target)
+    return target, len(result.getbands()) * result.size[0] * result.size[1]
+
+
+def cipher_sdes(path, key, mode, output_dir):
+    from SDES import decrypt_bytes, encrypt_bytes
+    from PIL import Image
+
+    pixels = load_pixels(path)
+    process = encrypt_bytes if mode == "encrypt" else decrypt_bytes
+    target = output_path(path, mode, output_dir)
+    Image.fromarray(process(pixels, key)).save(target)
+    return target, pixels.nbytes
+
+
+def cipher_hill(path, key, mode, output_dir):
+    from HillCipher import height_info, hill_cipher_pixels, select_key, stored_height
+    from PIL import Image
+
+    if key.endswith(".npy"):
+        key_matrix = np.load(key)
+    else:
+        key_matrix = np.loadtxt(key, delimiter="," if key.endswith(".csv") else None, ndmin=2)
+    matrix = select_key(key_matrix.astype(np.int64), mode)
+
+    pixels = load_pixels(path)
+    target = output_path(path, mode, output_dir)
+    if mode == "encrypt":
+        result = hill_cipher_pixels(pixels, matrix, keep_padding=True)
+        Image.fromarray(result.astype(np.uint8)).save(target, pnginfo=height_info(len(pixels)))
+        return target, pixels.nbytes
+
+    if len(pixels) % len(matrix):
+        raise ValueError(f"{path} height is not a multiple of the key size")
+    height = stored_height(path) or len(pixels)
+    result = hill_cipher_pixels(pixels, matrix)[:height]
+    Image.fromarray(result.astype(np.uint8)).save(target)
+    return target, result.nbytes
+
+
+def cipher_playfair(path, key, mode, output_dir):
+    from PlayFairImage import generate_matrix_from_image, playfair_pixels
+    from PIL import Image
+
+    matrix = generate_matrix_from_image(key)
+    pixels = load_pixels(path)
+    result = playfair_pixels(pixels, matrix, decrypt=(mode == "decrypt"), workers=1)
+    target = output_path(path, mode, output_dir)
+    Image.fromarray(result).save(target)
+    return target, pixels.nbytes
+
+
+def cipher_knapsack(path, key, mode, output_dir):
+    from KnapsackImage import load_ciphertext, load_keys, save_ciphertext
+    from PIL import Image
+
+    knapsack = load_keys(key)
+    if mode == "encrypt":
+        img = Image.open(path)
+        if img.mode not in ("L", "RGB", "RGBA"):
+            img = img.convert("RGB")
+        pixels = np.asarray(img, dtype=np.uint8)
+        target = output_path(path, mode, output_dir, ".knap")
+        save_ciphertext(target, knapsack.encrypt(pixels), knapsack.public_key,
+                        shape=pixels.shape, mode=img.mode)
+        return target, pixels.nbytes
+
+    ciphertext, header = load_ciphertext(path)
+    if header["public_key"] != knapsack.public_key:
+        raise ValueError(f"{path} was not encrypted with the key in {key}")
+    size = int(np.prod(header["shape"]))
+    pixels = knapsack.decrypt(ciphertext, size).reshape(header["shape"])
+    if pixels.shape[-1] == 1:
+        pixels = pixels[..., 0]
+    target = output_path(path, mode, output_dir)
+    Image.fromarray(pixels).save(target)
+    return target, pixels.nbytes
+
+
+CIPHERS = {
+    "shift": cipher_shift,
+    "sdes": cipher_sdes,
+    "hill": cipher_hill,
+    "playfair": cipher_playfair,
+    "knapsack": cipher_knapsack,
+}
+
+
+def verify_round_trip(algorithm, key, path, target):
+    # Decrypt an encrypted output into a scratch directory and compare pixels
+    with tempfile.TemporaryDirectory() as scratch:
+        decrypted, _ = CIPHERS[algorithm](target, key, "decrypt", scratch)
+        original, restored = load_pixels(path), load_pixels(decrypted)
+    if original.shape != restored.shape or not np.array_equal(original, restored):
+        raise ValueError(f"{target} does not decrypt back to {path}")
+
+
+def warm_up(algorithm):
+    # Worker initializer: import the cipher module and load PIL's format
+    # plugins up front, so the first file's timing does not include them
+    import importlib
+
+    from PIL import Image
+
+    importlib.import_module(CIPHER_MODULES[algorithm])
+    Image.init()
+
+
+def process_file(algorithm, key, mode, path, output_dir=None, verify=False):
+    # Runs in a worker process started with warm_up. The reported time covers
+    # the cipher only, not the verification.
+    start = time.perf_counter()
+    target, size = CIPHERS[algorithm](path, key, mode, output_dir)
+    seconds = time.perf_counter() - start
+    if verify and mode == "encrypt":
+        verify_round_trip(algorithm, key, path, target)
+    return path, target, size, seconds
+
+
+def expand_inputs(inputs, algorithm, mode):
+    # Directories, glob patterns and plain files, in a stable order
+    extensions = (".knap",) if algorithm == "knapsack" and mode == "decrypt" else IMAGE_EXTENSIONS
+    paths = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            paths.extend(
+                os.path.join(pattern, name) for name in sorted(os.listdir(pattern))
+                if name.lower().endswith(extensions)
+            )
+        else:
+            paths.extend(sorted(glob.glob(pattern)))
+    return list(dict.fromkeys(paths))
+
+
+def prepare_key(algorithm, key, mode):
+    if algorithm == "knapsack" and mode == "encrypt" and not os.path.exists(key):
+        from KnapsackImage import KnapsackCryptosystem, save_keys
+
+        save_keys(key, KnapsackCryptosystem())
+        print(f"Wrote new knapsack key to {key}")
+    elif algorithm in ("hill", "playfair", "knapsack") and not os.path.exists(key):
+        raise SystemExit(f"Key file not found: {key}")
+
+
+def run_batch(algorithm, key, mode, paths, output_dir=None, workers=None, verify=False):
+    # Returns (results, failures, wall seconds); results are process_file tuples
+    results, failures = [], []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_up, initargs=(algorithm,)) as pool:
+        futures = {
+            path: pool.submit(process_file, algorithm, key, mode, path, output_dir, verify)
+            for path in paths
+        }
+        for path, future in futures.items():
+            try:
+                result = future.result()
+            except Exception as error:
+                failures.append((path, error))
+                print(f"FAILED {path}: {error}")
+                continue
+            results.append(result)
+            source, target, size, seconds = result
+            print(f"{source} -> {target}: {size / 1e6:.2f} MB in {seconds * 1000:.1f} ms "
+                  f"({size / seconds / 1e6:.1f} MB/s)")
+    return results, failures, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch image encryption and decryption.")
+    parser.add_argument("algorithm", choices=ALGORITHMS)
+    parser.add_argument("key", help="Key or key file; see the module docstring for each algorithm")
+    parser.add_argument("mode", choices=("encrypt", "decrypt"))
+    parser.add_argument("inputs", nargs="+", help="Image files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", help="Where to write results (default: next to each input)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Worker processes (default: number of CPUs)")
+    parser.add_argument("--verify", action="store_true",
+                        help="When encrypting, decrypt each output again and check it matches the input")
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs, args.algorithm, args.mode)
+    if not paths:
+        raise SystemExit("No input files matched")
+    prepare_key(args.algorithm, args.key, args.mode)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    results, failures, wall = run_batch(args.algorithm, args.key, args.mode, paths,
+                                        args.output_dir, args.workers, args.verify)
+    total = sum(size for _, _, size, _ in results)
+    print(f"{len(results)} files, {total / 1e6:.2f} MB in {wall:.2f} s "
+          f"({total / wall / 1e6:.1f} MB/s aggregate), {len(failures)} failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
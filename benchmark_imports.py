@@ -0,0 +1,95 @@
+"""Cold-start import benchmark for the cipher modules.
+
+Each module is imported in a fresh interpreter, inside an empty temporary
+directory, and the script fails (exit status 1) when any of them
+
+  - takes longer than the budget to import (median of several runs, from
+    python -X importtime, so interpreter startup is not counted),
+  - pulls in an optional heavy dependency (matplotlib, tabulate, PIL), or
+  - leaves files behind, i.e. still runs a demo at import time.
+
+    python benchmark_imports.py
+    python benchmark_imports.py --budget-ms 250 --repeats 7 SDES HillCipher
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that worker processes import; PlayFairImage is PIL based by design
+MODULES = ("SDES", "HillCipher", "KnapsackImage", "KnapsackEncryption", "Cypher",
+           "PlayFair", "YakshSDESAlpha", "batch_cipher")
+LAZY_DEPENDENCIES = ("matplotlib", "tabulate", "PIL")
+
+PROBE = (
+    "import sys, {module}; "
+    "print(','.join(name for name in {lazy!r} if name in sys.modules))"
+)
+
+
+def import_once(module):
+    # Returns (cumulative import time in ms, heavy modules loaded, stray files)
+    with tempfile.TemporaryDirectory() as cwd:
+        env = dict(os.environ, PYTHONPATH=REPO, PYTHONDONTWRITEBYTECODE="1", MPLBACKEND="Agg")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module, lazy=LAZY_DEPENDENCIES)],
+            cwd=cwd, env=env, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=120,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+        stray = sorted(os.listdir(cwd))
+
+    # Lines look like "import time:  self [us] | cumulative | name"
+    match = re.search(rf"^import time:\s*\d+ \|\s*(\d+) \| {re.escape(module)}$", result.stderr, re.M)
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return int(match.group(1)) / 1000, loaded, stray
+
+
+def benchmark_imports(modules=MODULES, repeats=5, budget_ms=500.0):
+    # Prints one row per module and returns the list of failure messages
+    failures = []
+    print(f"{'module':<20} {'median ms':>10} {'min ms':>8}  heavy deps")
+    for module in modules:
+        try:
+            runs = [import_once(module) for _ in range(repeats)]
+        except RuntimeError as error:
+            failures.append(str(error))
+            print(f"{module:<20} {'error':>10}")
+            continue
+
+        times = [elapsed for elapsed, _, _ in runs]
+        loaded = sorted({name for _, names, _ in runs for name in names})
+        stray = sorted({name for _, _, names in runs for name in names})
+        median = statistics.median(times)
+        print(f"{module:<20} {median:>10.1f} {min(times):>8.1f}  {', '.join(loaded) or '-'}")
+
+        if median > budget_ms:
+            failures.append(f"{module} took {median:.1f} ms to import (budget {budget_ms:.0f} ms)")
+        if loaded:
+            failures.append(f"{module} imports {', '.join(loaded)} eagerly")
+        if stray:
+            failures.append(f"{module} wrote {', '.join(stray)} at import time")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Guard the cold-start import time of the cipher modules.")
+    parser.add_argument("modules", nargs="*", default=list(MODULES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=500.0,
+                        help="Maximum median import time per module, including numpy")
+    args = parser.parse_args(argv)
+
+    failures = benchmark_imports(args.modules, args.repeats, args.budget_ms)
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())